@@ -0,0 +1,65 @@
+import json
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+from typing_extensions import Annotated
+
+from benchmarks.use_cases.benchmark_suite import BenchmarkSuite
+
+
+log: Logger = logging.getLogger(__name__)
+
+
+def main(
+    candlestick_rows: Annotated[
+        int,
+        typer.Option(help='Number of Binance klines adapted and gap filled by the candlestick data benchmark')
+    ] = 1000000,
+    trading_candles: Annotated[
+        int,
+        typer.Option(help='Number of synthetic lower interval candles the trading environment is benchmarked on')
+    ] = 100000,
+    environment_steps: Annotated[
+        int,
+        typer.Option(help='Number of time steps made by the environment step benchmarks')
+    ] = 10000,
+    batch_sizes: Annotated[
+        list[int],
+        typer.Option(help='Batch sizes of the policy forward benchmarks (repeatable)')
+    ] = [1, 16, 256],
+    episode_lengths: Annotated[
+        list[int],
+        typer.Option(help='Episode lengths of the PPO agent update benchmarks (repeatable)')
+    ] = [256, 864],
+    repeats: Annotated[int, typer.Option(help='Number of times each benchmark is repeated (best time kept)')] = 3,
+    output: Annotated[
+        Optional[Path],
+        typer.Option(help='JSON file the benchmark results are written to (printed if not given)', show_default=False)
+    ] = None
+) -> None:
+    log.info('Starting application...')
+    try:
+        result: dict[str, Any] = BenchmarkSuite().run_benchmark_suite(
+            candlestick_rows=candlestick_rows,
+            trading_candles=trading_candles,
+            environment_steps=environment_steps,
+            batch_sizes=batch_sizes,
+            episode_lengths=episode_lengths,
+            repeats=repeats,
+            output=output
+        )
+        if output is None:
+            typer.echo(json.dumps(result, indent=2))
+    except Exception as exception:
+        log.error(f'Exception found: {exception.__class__.__name__} - {exception}')
+        raise typer.Exit(code=1)
+    finally:
+        log.info('Application stopped')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s.%(msecs)03d - %(message)s', datefmt='%d-%m-%Y %H:%M:%S', level=logging.INFO)
+    typer.run(main)
@@ -0,0 +1,141 @@
+import json
+import logging
+import platform
+from datetime import datetime, timezone
+from logging import Logger
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+import torch
+from numpy.typing import NDArray
+
+from benchmarks.use_cases.candlestick_data_adaptation_benchmark import CandlestickDataAdaptationBenchmark
+from benchmarks.use_cases.ppo_benchmark import PpoBenchmark
+from trading_bot.agents.trading_agent_action import TradingAgentAction
+from trading_bot.candlestick.candlestick_arrays import CandlestickArrays
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.environments.trading_environment import TradingEnvironment
+from trading_bot.environments.trading_market_data import TradingMarketData
+from trading_bot.policies.trading_ppo_policy import TradingPpoPolicy
+from validation.agents.lunar_lander_agent_action import LunarLanderAgentAction
+from validation.environments.lunar_lander_environment import LunarLanderEnvironment
+from validation.policies.lunar_lander_ppo_policy import LunarLanderPpoPolicy
+
+
+class BenchmarkSuite:
+    _log: Logger = logging.getLogger(__name__)
+    _start_timestamp: int = 1_500_000_000_000
+    _lower_interval: CandlestickDataInterval = CandlestickDataInterval.five_minutes
+    _higher_interval: CandlestickDataInterval = CandlestickDataInterval.one_hour
+    # Fixed by the kernel sizes of the trading PPO policy convolutions
+    _lower_interval_lookback_candles: int = 96
+    _higher_interval_lookback_candles: int = 120
+    _candlestick_data_adaptation_benchmark: CandlestickDataAdaptationBenchmark = CandlestickDataAdaptationBenchmark()
+    _ppo_benchmark: PpoBenchmark = PpoBenchmark()
+
+    def run_benchmark_suite(
+        self,
+        candlestick_rows: int,
+        trading_candles: int,
+        environment_steps: int,
+        batch_sizes: list[int],
+        episode_lengths: list[int],
+        repeats: int,
+        output: Path | None = None
+    ) -> dict[str, Any]:
+        self._log.info('Running benchmark suite...')
+        result: dict[str, Any] = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python_version': platform.python_version(),
+            'numpy_version': np.__version__,
+            'torch_version': torch.__version__,
+            'device': str(TradingPpoPolicy(uuid4()).get_device()),
+            'torch_threads': torch.get_num_threads(),
+            'candlestick_data_adaptation': (
+                self._candlestick_data_adaptation_benchmark.run_candlestick_data_adaptation_benchmark(
+                    rows=candlestick_rows,
+                    repeats=repeats
+                )
+            ),
+            'trading': self._ppo_benchmark.run_ppo_benchmark(
+                name='Trading',
+                environment=TradingEnvironment(
+                    market_data=self._get_market_data(trading_candles),
+                    lower_interval_lookback_candles=self._lower_interval_lookback_candles,
+                    higher_interval_lookback_candles=self._higher_interval_lookback_candles
+                ),
+                agent_actions=len(TradingAgentAction),
+                ppo_policy_factory=lambda: TradingPpoPolicy(uuid4()),
+                environment_steps=environment_steps,
+                batch_sizes=batch_sizes,
+                episode_lengths=episode_lengths,
+                repeats=repeats
+            ),
+            'lunar_lander': self._ppo_benchmark.run_ppo_benchmark(
+                name='Lunar Lander',
+                environment=LunarLanderEnvironment(),
+                agent_actions=len(LunarLanderAgentAction),
+                ppo_policy_factory=LunarLanderPpoPolicy,
+                environment_steps=environment_steps,
+                batch_sizes=batch_sizes,
+                episode_lengths=episode_lengths,
+                repeats=repeats
+            )
+        }
+        if output is not None:
+            output.write_text(json.dumps(result, indent=2))
+            self._log.info(f'Benchmark results written to \'{output}\'')
+        self._log.info('Benchmark suite completed')
+        return result
+
+    def _get_market_data(self, candles: int) -> TradingMarketData:
+        # Synthetic random walk, with every higher interval candle aggregating the lower interval ones it encloses
+        random_generator: np.random.Generator = np.random.default_rng(0)
+        lower_interval_milliseconds: int = int(self._lower_interval.to_seconds() * 1000)
+        higher_interval_milliseconds: int = int(self._higher_interval.to_seconds() * 1000)
+        lower_candles_per_higher_candle: int = higher_interval_milliseconds // lower_interval_milliseconds
+        candles -= candles % lower_candles_per_higher_candle
+        close_prices: NDArray[np.float64] = 100.0 * np.exp(np.cumsum(random_generator.normal(0.0, 0.001, candles)))
+        open_prices: NDArray[np.float64] = np.concatenate(([100.0], close_prices[:-1]))
+        spreads: NDArray[np.float64] = np.abs(random_generator.normal(0.0, 0.0005, (2, candles))) * close_prices
+        lower_interval_prices: NDArray[np.float32] = np.stack(
+            [
+                open_prices,
+                np.maximum(open_prices, close_prices) + spreads[0],
+                np.minimum(open_prices, close_prices) - spreads[1],
+                close_prices
+            ],
+            axis=-1
+        ).astype(np.float32)
+        grouped_lower_interval_prices: NDArray[np.float32] = lower_interval_prices.reshape(
+            -1,
+            lower_candles_per_higher_candle,
+            lower_interval_prices.shape[1]
+        )
+        higher_interval_prices: NDArray[np.float32] = np.stack(
+            [
+                grouped_lower_interval_prices[:, 0, CandlestickArrays.open_price_index],
+                grouped_lower_interval_prices[:, :, CandlestickArrays.high_price_index].max(axis=1),
+                grouped_lower_interval_prices[:, :, CandlestickArrays.low_price_index].min(axis=1),
+                grouped_lower_interval_prices[:, -1, CandlestickArrays.close_price_index]
+            ],
+            axis=-1
+        )
+        lower_interval_open_times: NDArray[np.int64] = (
+            self._start_timestamp + np.arange(candles, dtype=np.int64) * lower_interval_milliseconds
+        )
+        higher_interval_open_times: NDArray[np.int64] = lower_interval_open_times[::lower_candles_per_higher_candle]
+        return TradingMarketData.from_candlestick_arrays(
+            lower_interval_candlestick_arrays=CandlestickArrays(
+                open_times=lower_interval_open_times,
+                close_times=lower_interval_open_times + lower_interval_milliseconds - 1,
+                prices=lower_interval_prices
+            ),
+            higher_interval_candlestick_arrays=CandlestickArrays(
+                open_times=higher_interval_open_times,
+                close_times=higher_interval_open_times + higher_interval_milliseconds - 1,
+                prices=higher_interval_prices
+            )
+        )
@@ -0,0 +1,75 @@
+import logging
+import random
+import time
+from logging import Logger
+
+from pandas import DataFrame
+
+from trading_bot.candlestick.binance_kline_message_adapter import BinanceKlineMessageAdapter
+from trading_bot.candlestick.candlestick_data_gap_filler import CandlestickDataGapFiller
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+
+
+class CandlestickDataAdaptationBenchmark:
+    _log: Logger = logging.getLogger(__name__)
+    _start_timestamp: int = 1_500_000_000_000
+    _missing_candles_ratio: float = 0.01
+    _interval: CandlestickDataInterval = CandlestickDataInterval.five_minutes
+    _binance_kline_message_adapter: BinanceKlineMessageAdapter = BinanceKlineMessageAdapter()
+    _candlestick_data_gap_filler: CandlestickDataGapFiller = CandlestickDataGapFiller()
+
+    def run_candlestick_data_adaptation_benchmark(self, rows: int, repeats: int) -> dict[str, float]:
+        self._log.info(f'Benchmarking candlestick data adaptation over {rows} Binance klines...')
+        message: list[list[int | str]] = self._get_message(rows)
+        adaptation_seconds: float = float('inf')
+        gap_filling_seconds: float = float('inf')
+        for _ in range(repeats):
+            start_time: float = time.perf_counter()
+            candlestick_data: DataFrame = self._binance_kline_message_adapter.adapt_message_to_dataframe(message)
+            adaptation_seconds = min(adaptation_seconds, time.perf_counter() - start_time)
+            start_time = time.perf_counter()
+            self._candlestick_data_gap_filler.fill_missing_values(data=candlestick_data, interval=self._interval)
+            gap_filling_seconds = min(gap_filling_seconds, time.perf_counter() - start_time)
+        self._log.info(
+            f'Kline message adaptation - {adaptation_seconds:0.3f} seconds - {rows / adaptation_seconds:0.0f} rows '
+            f'per second'
+        )
+        self._log.info(
+            f'Missing values filling - {gap_filling_seconds:0.3f} seconds - {rows / gap_filling_seconds:0.0f} rows '
+            f'per second'
+        )
+        return {
+            'kline_message_adaptation_seconds': adaptation_seconds,
+            'kline_message_adaptation_rows_per_second': rows / adaptation_seconds,
+            'missing_values_filling_seconds': gap_filling_seconds,
+            'missing_values_filling_rows_per_second': rows / gap_filling_seconds
+        }
+
+    def _get_message(self, rows: int) -> list[list[int | str]]:
+        # Synthetic payload shaped as the Binance one, with some candles missing to be filled
+        random_generator: random.Random = random.Random(0)
+        interval_in_milliseconds: int = int(self._interval.to_seconds() * 1000)
+        result: list[list[int | str]] = []
+        row: int
+        for row in range(rows):
+            if 0 < row < rows - 1 and random_generator.random() < self._missing_candles_ratio:
+                continue
+            open_timestamp: int = self._start_timestamp + row * interval_in_milliseconds
+            price: float = 100.0 + random_generator.random()
+            result.append(
+                [
+                    open_timestamp,
+                    f'{price:.8f}',
+                    f'{price + 1.0:.8f}',
+                    f'{price - 1.0:.8f}',
+                    f'{price + 0.5:.8f}',
+                    f'{10.0 * random_generator.random():.8f}',
+                    open_timestamp + interval_in_milliseconds - 1,
+                    '0.0',
+                    0,
+                    '0.0',
+                    '0.0',
+                    '0'
+                ]
+            )
+        return result
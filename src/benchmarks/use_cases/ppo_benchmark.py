@@ -0,0 +1,147 @@
+import logging
+import random
+import time
+from logging import Logger
+from typing import Any, Callable
+
+import torch
+
+from reinforcement_learning import Environment, EnvironmentState, PpoPolicy, VectorEnvironment
+from reinforcement_learning.agents.ppo_agent import PpoAgent
+from reinforcement_learning.agents.ppo_rollout import PpoRollout
+from reinforcement_learning.agents.ppo_rollout_collector import PpoRolloutCollector
+
+
+class PpoBenchmark:
+    _log: Logger = logging.getLogger(__name__)
+    _forward_states: int = 4096
+    _learning_rate: float = 3e-4
+    _gamma: float = 0.99
+    _gae_lambda: float = 1.0
+    _eps_clip: float = 0.2
+    _update_epochs: int = 4
+
+    def run_ppo_benchmark(
+        self,
+        name: str,
+        environment: Environment,
+        agent_actions: int,
+        ppo_policy_factory: Callable[[], PpoPolicy],
+        environment_steps: int,
+        batch_sizes: list[int],
+        episode_lengths: list[int],
+        repeats: int
+    ) -> dict[str, Any]:
+        self._log.info(f'Benchmarking {name} PPO hot paths...')
+        environment_steps_per_second: float = self._get_environment_steps_per_second(
+            environment=environment,
+            agent_actions=agent_actions,
+            environment_steps=environment_steps,
+            repeats=repeats
+        )
+        self._log.info(f'{name} environment step - {environment_steps_per_second:0.0f} steps per second')
+        ppo_policy: PpoPolicy = ppo_policy_factory()
+        policy_forward_states_per_second: dict[str, float] = {}
+        batch_size: int
+        for batch_size in batch_sizes:
+            policy_forward_states_per_second[str(batch_size)] = self._get_policy_forward_states_per_second(
+                environment=environment,
+                agent_actions=agent_actions,
+                ppo_policy=ppo_policy,
+                batch_size=batch_size,
+                repeats=repeats
+            )
+            self._log.info(
+                f'{name} policy forward - Batch size {batch_size} - '
+                f'{policy_forward_states_per_second[str(batch_size)]:0.0f} states per second'
+            )
+        ppo_agent_update_seconds: dict[str, float] = {}
+        episode_length: int
+        for episode_length in episode_lengths:
+            ppo_agent_update_seconds[str(episode_length)] = self._get_ppo_agent_update_seconds(
+                environment=environment,
+                ppo_policy_factory=ppo_policy_factory,
+                episode_length=episode_length,
+                repeats=repeats
+            )
+            self._log.info(
+                f'{name} PPO agent update - Episode length {episode_length} - '
+                f'{ppo_agent_update_seconds[str(episode_length)]:0.3f} seconds'
+            )
+        return {
+            'environment_steps_per_second': environment_steps_per_second,
+            'policy_forward_states_per_second': policy_forward_states_per_second,
+            'ppo_agent_update_seconds': ppo_agent_update_seconds
+        }
+
+    @staticmethod
+    def _get_environment_steps_per_second(
+        environment: Environment,
+        agent_actions: int,
+        environment_steps: int,
+        repeats: int
+    ) -> float:
+        random_generator: random.Random = random.Random(0)
+        best_seconds: float = float('inf')
+        for _ in range(repeats):
+            environment.reset(environment_steps)
+            start_time: float = time.perf_counter()
+            for _ in range(environment_steps):
+                environment_state: EnvironmentState = environment.make_step(random_generator.randrange(agent_actions))
+                if environment_state.done:
+                    environment.reset(environment_steps)
+            best_seconds = min(best_seconds, time.perf_counter() - start_time)
+        return environment_steps / best_seconds
+
+    def _get_policy_forward_states_per_second(
+        self,
+        environment: Environment,
+        agent_actions: int,
+        ppo_policy: PpoPolicy,
+        batch_size: int,
+        repeats: int
+    ) -> float:
+        # States are converted to tensors on every forward, as they are while collecting rollouts
+        random_generator: random.Random = random.Random(0)
+        environment_states: list[EnvironmentState] = [environment.reset(batch_size)]
+        while len(environment_states) < batch_size:
+            environment_states.append(environment.make_step(random_generator.randrange(agent_actions)))
+        forwards: int = max(1, self._forward_states // batch_size)
+        best_seconds: float = float('inf')
+        for _ in range(repeats):
+            start_time: float = time.perf_counter()
+            with torch.no_grad():
+                for _ in range(forwards):
+                    ppo_policy.forward(environment_states)
+            best_seconds = min(best_seconds, time.perf_counter() - start_time)
+        return forwards * batch_size / best_seconds
+
+    def _get_ppo_agent_update_seconds(
+        self,
+        environment: Environment,
+        ppo_policy_factory: Callable[[], PpoPolicy],
+        episode_length: int,
+        repeats: int
+    ) -> float:
+        ppo_policy_old: PpoPolicy = ppo_policy_factory()
+        ppo_agent: PpoAgent = PpoAgent(
+            ppo_policy=ppo_policy_factory(),
+            ppo_policy_old=ppo_policy_old,
+            learning_rate=self._learning_rate,
+            gamma=self._gamma,
+            gae_lambda=self._gae_lambda,
+            eps_clip=self._eps_clip,
+            update_epochs=self._update_epochs
+        )
+        # Fixed length rollouts, so finished episodes do not shorten the updated trajectories
+        ppo_rollout: PpoRollout = PpoRolloutCollector(
+            vector_environment=VectorEnvironment([environment]),
+            max_time_steps=episode_length,
+            rollout_steps=episode_length
+        ).collect_rollout(ppo_policy_old)
+        best_seconds: float = float('inf')
+        for _ in range(repeats):
+            start_time: float = time.perf_counter()
+            ppo_agent.update(ppo_rollout.ppo_rollout_buffer)
+            best_seconds = min(best_seconds, time.perf_counter() - start_time)
+        return best_seconds
@@ -1,6 +1,11 @@
+from reinforcement_learning.agents.ppo_agent_checkpoint import PpoAgentCheckpoint
+from reinforcement_learning.diagnostics.metrics_sink_kind import MetricsSinkKind
+from reinforcement_learning.diagnostics.profiler_kind import ProfilerKind
 from reinforcement_learning.environments.environment import Environment
 from reinforcement_learning.environments.environment_episode_summary import EnvironmentEpisodeSummary
 from reinforcement_learning.environments.environment_state import EnvironmentState
+from reinforcement_learning.environments.i_environment_factory import IEnvironmentFactory
+from reinforcement_learning.environments.vector_environment import VectorEnvironment
 from reinforcement_learning.policies.i_ppo_policies_persistence import IPpoPoliciesPersistence
 from reinforcement_learning.policies.ppo_policy import PpoPolicy
 from reinforcement_learning.policies.ppo_policy_output import PpoPolicyOutput
@@ -0,0 +1,55 @@
+import torch
+from torch import Tensor
+
+
+class GeneralizedAdvantageEstimator:
+    _chunk_size: int = 128
+    _gamma: float
+    _gae_lambda: float
+
+    def __init__(self, gamma: float, gae_lambda: float) -> None:
+        self._gamma = gamma
+        self._gae_lambda = gae_lambda
+
+    def compute_advantages(
+        self,
+        rewards: Tensor,
+        dones: Tensor,
+        truncateds: Tensor,
+        values: Tensor,
+        next_values: Tensor
+    ) -> Tensor:
+        # Every tensor is laid out as [time step, environment]. Truncated episodes keep their bootstrap value but, as
+        # finished ones, stop accumulating the advantages of the following time steps
+        continuations: Tensor = 1.0 - dones.to(rewards.dtype)
+        deltas: Tensor = rewards + self._gamma * next_values * continuations - values
+        return self._get_discounted_reverse_cumulative_sum(deltas=deltas, dones=(dones | truncateds).to(rewards.dtype))
+
+    def _get_discounted_reverse_cumulative_sum(self, deltas: Tensor, dones: Tensor) -> Tensor:
+        # Solves advantage[t] = delta[t] + gamma * lambda * (1 - done[t]) * advantage[t + 1] chunk by chunk from the
+        # end: inside a chunk it is a single product with a matrix of discounts masked to time steps of the same
+        # episode, and the first advantage of each chunk is carried into the previous one
+        result: Tensor = torch.empty_like(deltas)
+        next_advantages: Tensor = torch.zeros_like(deltas[0])
+        discount: Tensor = torch.tensor(
+            data=(self._gamma * self._gae_lambda),
+            device=deltas.device,
+            dtype=deltas.dtype
+        )
+        end: int
+        for end in range(len(deltas), 0, -self._chunk_size):
+            start: int = max(0, end - self._chunk_size)
+            chunk_dones: Tensor = dones[start:end]
+            episodes: Tensor = torch.cumsum(chunk_dones, dim=0) - chunk_dones
+            last_episodes: Tensor = episodes[-1] + chunk_dones[-1]
+            steps: Tensor = torch.arange(end - start, device=deltas.device)
+            exponents: Tensor = steps[None, :] - steps[:, None]
+            discounts: Tensor = torch.where(exponents >= 0, discount ** exponents.clamp(min=0), 0.0)
+            weights: Tensor = discounts[:, :, None] * (episodes[:, None, :] == episodes[None, :, :])
+            chunk_advantages: Tensor = torch.einsum('tkn,kn->tn', weights, deltas[start:end])
+            chunk_advantages += (
+                (discount ** (end - start - steps))[:, None] * (episodes == last_episodes) * next_advantages
+            )
+            result[start:end] = chunk_advantages
+            next_advantages = chunk_advantages[0]
+        return result
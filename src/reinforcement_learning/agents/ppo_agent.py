@@ -1,12 +1,20 @@
+import random
+from typing import Any
+
+import numpy as np
 import torch
+from numpy.typing import NDArray
 from torch import device, Tensor
 from torch.distributions import Categorical
 from torch.nn import MSELoss
 from torch.nn.utils import clip_grad_norm_
 from torch.optim import Adam
 
-from reinforcement_learning.agents.ppo_agent_selected_action import PpoAgentSelectedAction
-from reinforcement_learning.environments.environment_state import EnvironmentState
+from reinforcement_learning.agents.generalized_advantage_estimator import GeneralizedAdvantageEstimator
+from reinforcement_learning.agents.ppo_agent_checkpoint import PpoAgentCheckpoint
+from reinforcement_learning.agents.ppo_agent_update import PpoAgentUpdate
+from reinforcement_learning.agents.ppo_rollout_buffer import PpoRolloutBuffer
+from reinforcement_learning.diagnostics.phase_timer import PhaseTimer
 from reinforcement_learning.policies.ppo_policy import PpoPolicy
 from reinforcement_learning.policies.ppo_policy_output import PpoPolicyOutput
 
@@ -17,9 +25,11 @@ class PpoAgent:
     _device: device
     _optimizer: Adam
     _mse_loss: MSELoss
-    _gamma: float
+    _generalized_advantage_estimator: GeneralizedAdvantageEstimator
     _eps_clip: float
     _update_epochs: int
+    _minibatch_size: int | None
+    _target_kl_divergence: float | None
 
     def __init__(
         self,
@@ -27,91 +37,170 @@ class PpoAgent:
         ppo_policy_old: PpoPolicy,
         learning_rate: float,
         gamma: float,
+        gae_lambda: float,
         eps_clip: float,
-        update_epochs: int
+        update_epochs: int,
+        minibatch_size: int | None = None,
+        target_kl_divergence: float | None = None
     ) -> None:
         self._ppo_policy = ppo_policy
         self._ppo_policy_old = ppo_policy_old
         self._device = ppo_policy.get_device()
         self._optimizer = Adam(params=self._ppo_policy.parameters(), lr=learning_rate)
         self._mse_loss = MSELoss()
-        self._gamma = gamma
+        self._generalized_advantage_estimator = GeneralizedAdvantageEstimator(gamma=gamma, gae_lambda=gae_lambda)
         self._eps_clip = eps_clip
         self._update_epochs = update_epochs
+        self._minibatch_size = minibatch_size
+        self._target_kl_divergence = target_kl_divergence
 
-    def select_action(self, environment_state: EnvironmentState) -> PpoAgentSelectedAction:
-        with torch.no_grad():
-            ppo_policy_output: PpoPolicyOutput = self._ppo_policy_old([environment_state])
-        distribution: Categorical = Categorical(ppo_policy_output.action_probabilities)
-        action: Tensor = distribution.sample()
-        return PpoAgentSelectedAction(action_id=action.item(), log_probability=distribution.log_prob(action).item())
-
-    def update(
-        self,
-        environment_states: list[EnvironmentState],
-        ppo_agent_selected_actions: list[PpoAgentSelectedAction],
-        rewards: list[float],
-        dones: list[bool]
-    ) -> None:
-        actions: Tensor = torch.tensor(
-            data=[x.action_id for x in ppo_agent_selected_actions],
-            device=self._device,
-            dtype=torch.long
-        )
-        old_log_probabilities: Tensor = torch.tensor(
-            data=[x.log_probability for x in ppo_agent_selected_actions],
-            device=self._device,
-            dtype=torch.float32
-        )
-        rewards: Tensor = torch.tensor(
-            data=rewards,
-            device=self._device,
-            dtype=torch.float32
-        )
-        rewards = (rewards - rewards.mean()) / (rewards.std() + 1e-8)
-        dones: Tensor = torch.tensor(
-            data=dones,
-            device=self._device,
-            dtype=torch.float32
+    def update(self, ppo_rollout_buffer: PpoRolloutBuffer) -> PpoAgentUpdate:
+        phase_timer: PhaseTimer = PhaseTimer(self._device)
+        # Trajectories are flattened environment by environment, keeping only the time steps actually stepped
+        valids: Tensor = ppo_rollout_buffer.valids
+        flat_valids: Tensor = valids.T
+        input_tensors: tuple[Tensor, ...] = tuple(
+            x.transpose(0, 1)[flat_valids] for x in ppo_rollout_buffer.input_tensors
         )
+        actions: Tensor = ppo_rollout_buffer.actions.T[flat_valids]
+        old_log_probabilities: Tensor = ppo_rollout_buffer.log_probabilities.T[flat_valids]
+        valid_rewards: Tensor = ppo_rollout_buffer.rewards[valids]
+        rewards: Tensor = torch.zeros_like(ppo_rollout_buffer.rewards)
+        rewards[valids] = (valid_rewards - valid_rewards.mean()) / (valid_rewards.std() + 1e-8)
+        # Time steps past the end of an episode are masked as finished, with zero reward and value
+        dones: Tensor = ppo_rollout_buffer.dones | ~valids
+        # State values were recorded by the old policy while collecting the rollout
+        values: Tensor = ppo_rollout_buffer.values
         with torch.no_grad():
-            ppo_policy_output: PpoPolicyOutput = self._ppo_policy_old(environment_states)
-            values: Tensor = ppo_policy_output.state_values.squeeze()
-            values = torch.cat((values, torch.tensor(data=[0.0], device=self._device)))  # Bootstrap value
-            advantages: Tensor = self._compute_advantages(rewards, dones, values)
-            returns = advantages + values[:-1]
-        for _ in range(self._update_epochs):
-            ppo_policy_output: PpoPolicyOutput = self._ppo_policy(environment_states)
-            distribution: Categorical = Categorical(ppo_policy_output.action_probabilities)
-            log_probabilities: Tensor = distribution.log_prob(actions)
-            ratios: Tensor = torch.exp(log_probabilities - old_log_probabilities.detach())
-            surrogate_1: Tensor = ratios * advantages
-            surrogate_2: Tensor = torch.clamp(
-                input=ratios,
-                min=(1.0 - self._eps_clip),
-                max=(1.0 + self._eps_clip)
-            ) * advantages
-            actor_loss: Tensor = -torch.min(surrogate_1, surrogate_2).mean()
-            critic_loss: Tensor = self._mse_loss(
-                input=ppo_policy_output.state_values.squeeze(),
-                target=returns.detach()
+            next_values: Tensor = torch.where(
+                ppo_rollout_buffer.truncateds,
+                ppo_rollout_buffer.bootstrap_values,
+                torch.cat((values[1:], torch.zeros_like(values[:1])), dim=0)
             )
-            entropy_loss: Tensor = distribution.entropy().mean()
-            loss: Tensor = actor_loss + 0.5 * critic_loss - 0.01 * entropy_loss
-            self._optimizer.zero_grad()
-            loss.backward()
-            clip_grad_norm_(self._ppo_policy.parameters(), max_norm=0.5)
-            self._optimizer.step()
+            advantages: Tensor = self._generalized_advantage_estimator.compute_advantages(
+                rewards=rewards,
+                dones=dones,
+                truncateds=ppo_rollout_buffer.truncateds,
+                values=values,
+                next_values=next_values
+            ).T[flat_valids]
+            # Critic targets are built from the normalized advantages
+            advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
+            returns: Tensor = advantages + values.T[flat_valids]
+        time_steps: int = len(actions)
+        minibatch_size: int = min(self._minibatch_size or time_steps, time_steps)
+        # Minibatch statistics are kept as tensors and averaged once, not to synchronize with the device every step
+        actor_losses: list[Tensor] = []
+        critic_losses: list[Tensor] = []
+        entropies: list[Tensor] = []
+        approximate_kl_divergences: list[Tensor] = []
+        for _ in range(self._update_epochs):
+            permutation: Tensor = torch.randperm(time_steps, device=self._device)
+            is_kl_divergence_exceeded: bool = False
+            start: int
+            for start in range(0, time_steps, minibatch_size):
+                with phase_timer.measure('update_forward'):
+                    indices: Tensor = permutation[start:(start + minibatch_size)]
+                    ppo_policy_output: PpoPolicyOutput = self._ppo_policy.forward_tensors(
+                        *(x[indices] for x in input_tensors)
+                    )
+                    distribution: Categorical = Categorical(ppo_policy_output.action_probabilities)
+                    log_probabilities: Tensor = distribution.log_prob(actions[indices])
+                    log_ratios: Tensor = log_probabilities - old_log_probabilities[indices].detach()
+                    ratios: Tensor = torch.exp(log_ratios)
+                    surrogate_1: Tensor = ratios * advantages[indices]
+                    surrogate_2: Tensor = torch.clamp(
+                        input=ratios,
+                        min=(1.0 - self._eps_clip),
+                        max=(1.0 + self._eps_clip)
+                    ) * advantages[indices]
+                    actor_loss: Tensor = -torch.min(surrogate_1, surrogate_2).mean()
+                    critic_loss: Tensor = self._mse_loss(
+                        input=ppo_policy_output.state_values.squeeze(dim=-1),
+                        target=returns[indices].detach()
+                    )
+                    entropy_loss: Tensor = distribution.entropy().mean()
+                    loss: Tensor = actor_loss + 0.5 * critic_loss - 0.01 * entropy_loss
+                with phase_timer.measure('update_backward'):
+                    self._optimizer.zero_grad()
+                    loss.backward()
+                with phase_timer.measure('update_optimizer'):
+                    clip_grad_norm_(self._ppo_policy.parameters(), max_norm=0.5)
+                    self._optimizer.step()
+                with torch.no_grad():
+                    approximate_kl_divergence: Tensor = ((ratios - 1.0) - log_ratios).mean()
+                actor_losses.append(actor_loss.detach())
+                critic_losses.append(critic_loss.detach())
+                entropies.append(entropy_loss.detach())
+                approximate_kl_divergences.append(approximate_kl_divergence)
+                if (
+                    self._target_kl_divergence is not None and
+                    approximate_kl_divergence.item() > self._target_kl_divergence
+                ):
+                    is_kl_divergence_exceeded = True
+                    break
+            if is_kl_divergence_exceeded:
+                break
         self._ppo_policy_old.load_state_dict(self._ppo_policy.state_dict())
+        return PpoAgentUpdate(
+            actor_loss=torch.stack(actor_losses).mean().item(),
+            critic_loss=torch.stack(critic_losses).mean().item(),
+            entropy=torch.stack(entropies).mean().item(),
+            approximate_kl_divergence=torch.stack(approximate_kl_divergences).mean().item(),
+            phase_seconds=phase_timer.pop_phase_seconds()
+        )
+
+    def get_checkpoint(self, episode: int, episode_rewards: list[float]) -> PpoAgentCheckpoint:
+        # Copied to CPU, as training keeps updating the parameters and optimizer moments in place while written
+        return PpoAgentCheckpoint(
+            episode=episode,
+            episode_rewards=episode_rewards,
+            ppo_policy_state_dict=self._get_cpu_copy(self._ppo_policy.state_dict()),
+            optimizer_state_dict=self._get_cpu_copy(self._optimizer.state_dict()),
+            random_state=random.getstate(),
+            numpy_random_state=self._get_numpy_random_state(),
+            torch_random_state=torch.get_rng_state(),
+            torch_cuda_random_states=torch.cuda.get_rng_state_all() if torch.cuda.is_available() else []
+        )
+
+    def load_checkpoint(self, ppo_agent_checkpoint: PpoAgentCheckpoint) -> None:
+        self._ppo_policy.load_state_dict(ppo_agent_checkpoint.ppo_policy_state_dict)
+        self._ppo_policy_old.load_state_dict(ppo_agent_checkpoint.ppo_policy_state_dict)
+        # Optimizer moments are moved back to the device of their parameters when loaded
+        self._optimizer.load_state_dict(ppo_agent_checkpoint.optimizer_state_dict)
+        random.setstate(ppo_agent_checkpoint.random_state)
+        self._set_numpy_random_state(ppo_agent_checkpoint.numpy_random_state)
+        torch.set_rng_state(ppo_agent_checkpoint.torch_random_state)
+        if ppo_agent_checkpoint.torch_cuda_random_states and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all(ppo_agent_checkpoint.torch_cuda_random_states)
+
+    @staticmethod
+    def _get_numpy_random_state() -> tuple[Any, ...]:
+        # Kept as a tensor, as checkpoints are only loaded with tensors and plain Python values
+        bit_generator: str
+        keys: NDArray[np.uint32]
+        position: int
+        has_gauss: int
+        cached_gaussian: float
+        bit_generator, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+        return bit_generator, torch.from_numpy(keys.astype(np.int64)), position, has_gauss, cached_gaussian
+
+    @staticmethod
+    def _set_numpy_random_state(numpy_random_state: tuple[Any, ...]) -> None:
+        bit_generator: str
+        keys: Tensor
+        position: int
+        has_gauss: int
+        cached_gaussian: float
+        bit_generator, keys, position, has_gauss, cached_gaussian = numpy_random_state
+        np.random.set_state((bit_generator, keys.numpy().astype(np.uint32), position, has_gauss, cached_gaussian))
 
-    def _compute_advantages(self, rewards: Tensor, dones: Tensor, values: Tensor) -> Tensor:
-        advantages: list[Tensor] = []
-        gae: Tensor = torch.tensor(data=0.0, device=self._device, dtype=torch.float32)
-        step: int
-        for step in reversed(range(len(rewards))):
-            delta: Tensor = rewards[step] + self._gamma * values[step + 1] * (1 - dones[step]) - values[step]
-            gae = delta + self._gamma * gae
-            advantages.insert(0, gae)
-        result: Tensor = torch.tensor(data=advantages, device=self._device, dtype=torch.float32)
-        result = (result - result.mean()) / (result.std() + 1e-8)
-        return result
+    @classmethod
+    def _get_cpu_copy(cls, value: Any) -> Any:
+        if isinstance(value, Tensor):
+            return value.detach().to(device=device('cpu'), copy=True)
+        elif isinstance(value, dict):
+            return {k: cls._get_cpu_copy(v) for k, v in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return type(value)(cls._get_cpu_copy(x) for x in value)
+        return value
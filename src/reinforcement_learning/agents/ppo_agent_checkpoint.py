@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Any
+
+from torch import Tensor
+
+
+@dataclass
+class PpoAgentCheckpoint:
+    episode: int
+    episode_rewards: list[float]
+    ppo_policy_state_dict: dict[str, Tensor]
+    optimizer_state_dict: dict[str, Any]
+    random_state: tuple[Any, ...]
+    numpy_random_state: tuple[Any, ...]
+    torch_random_state: Tensor
+    torch_cuda_random_states: list[Tensor]
@@ -0,0 +1,60 @@
+import logging
+from logging import Logger
+from queue import Empty, Queue
+from threading import Thread
+from uuid import UUID
+
+from reinforcement_learning.agents.ppo_agent_checkpoint import PpoAgentCheckpoint
+from reinforcement_learning.policies.i_ppo_policies_persistence import IPpoPoliciesPersistence
+
+
+class PpoAgentCheckpointWriter:
+    _log: Logger = logging.getLogger(__name__)
+    _ppo_policies_persistence: IPpoPoliciesPersistence
+    _ppo_policy_id: UUID
+    _ppo_agent_checkpoints: Queue[PpoAgentCheckpoint | None]
+    _writer_thread: Thread
+
+    def __init__(self, ppo_policies_persistence: IPpoPoliciesPersistence, ppo_policy_id: UUID) -> None:
+        self._ppo_policies_persistence = ppo_policies_persistence
+        self._ppo_policy_id = ppo_policy_id
+        # A single checkpoint is kept pending, so a slow write is never waited for by training
+        self._ppo_agent_checkpoints = Queue(maxsize=1)
+        self._writer_thread = Thread(
+            target=self._write_ppo_agent_checkpoints,
+            name='ppo-agent-checkpoint-writer',
+            daemon=True
+        )
+        self._writer_thread.start()
+
+    def write_ppo_agent_checkpoint(self, ppo_agent_checkpoint: PpoAgentCheckpoint) -> None:
+        # A checkpoint still pending when a newer one arrives is superseded by it
+        try:
+            superseded_ppo_agent_checkpoint: PpoAgentCheckpoint | None = self._ppo_agent_checkpoints.get_nowait()
+            self._ppo_agent_checkpoints.task_done()
+            self._log.debug(f'PPO agent checkpoint at episode {superseded_ppo_agent_checkpoint.episode} superseded')
+        except Empty:
+            pass
+        self._ppo_agent_checkpoints.put_nowait(ppo_agent_checkpoint)
+
+    def close(self) -> None:
+        self._ppo_agent_checkpoints.put(None)
+        self._writer_thread.join()
+
+    def _write_ppo_agent_checkpoints(self) -> None:
+        is_closed: bool = False
+        while not is_closed:
+            ppo_agent_checkpoint: PpoAgentCheckpoint | None = self._ppo_agent_checkpoints.get()
+            try:
+                is_closed = ppo_agent_checkpoint is None
+                if not is_closed:
+                    self._ppo_policies_persistence.save_ppo_agent_checkpoint(
+                        ppo_policy_id=self._ppo_policy_id,
+                        ppo_agent_checkpoint=ppo_agent_checkpoint
+                    )
+            except Exception as exception:
+                self._log.error(
+                    f'Exception found writing PPO agent checkpoint: {exception.__class__.__name__} - {exception}'
+                )
+            finally:
+                self._ppo_agent_checkpoints.task_done()
@@ -1,7 +0,0 @@
-from dataclasses import dataclass
-
-
-@dataclass
-class PpoAgentSelectedAction:
-    action_id: int
-    log_probability: float
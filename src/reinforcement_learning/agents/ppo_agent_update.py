@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class PpoAgentUpdate:
+    actor_loss: float
+    critic_loss: float
+    entropy: float
+    approximate_kl_divergence: float
+    phase_seconds: dict[str, float]
@@ -0,0 +1,11 @@
+from dataclasses import dataclass, field
+
+from reinforcement_learning.agents.ppo_rollout_buffer import PpoRolloutBuffer
+from reinforcement_learning.agents.ppo_rollout_episode import PpoRolloutEpisode
+
+
+@dataclass
+class PpoRollout:
+    ppo_rollout_buffer: PpoRolloutBuffer
+    ppo_rollout_episodes: list[PpoRolloutEpisode]
+    phase_seconds: dict[str, float] = field(default_factory=dict)
@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from typing import Self
+
+import torch
+from torch import device, Tensor
+
+
+@dataclass
+class PpoRolloutBuffer:
+    input_tensors: tuple[Tensor, ...]
+    actions: Tensor
+    log_probabilities: Tensor
+    values: Tensor
+    rewards: Tensor
+    dones: Tensor
+    truncateds: Tensor
+    bootstrap_values: Tensor
+    valids: Tensor
+
+    @classmethod
+    def allocate(cls, time_steps: int, environments: int, input_tensors: tuple[Tensor, ...]) -> Self:
+        # Every tensor is laid out as [time step, environment, ...], sized after one batch of policy input tensors
+        device_: device = input_tensors[0].device
+        return cls(
+            input_tensors=tuple(
+                torch.zeros(size=(time_steps, environments, *x.shape[1:]), device=device_, dtype=x.dtype)
+                for x in input_tensors
+            ),
+            actions=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.long),
+            log_probabilities=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.float32),
+            values=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.float32),
+            rewards=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.float32),
+            dones=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.bool),
+            truncateds=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.bool),
+            bootstrap_values=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.float32),
+            valids=torch.zeros(size=(time_steps, environments), device=device_, dtype=torch.bool)
+        )
+
+    @classmethod
+    def concatenate(cls, ppo_rollout_buffers: list[Self]) -> Self:
+        return cls(
+            input_tensors=tuple(
+                torch.cat(tensors=x, dim=1) for x in zip(*[y.input_tensors for y in ppo_rollout_buffers])
+            ),
+            actions=torch.cat(tensors=[x.actions for x in ppo_rollout_buffers], dim=1),
+            log_probabilities=torch.cat(tensors=[x.log_probabilities for x in ppo_rollout_buffers], dim=1),
+            values=torch.cat(tensors=[x.values for x in ppo_rollout_buffers], dim=1),
+            rewards=torch.cat(tensors=[x.rewards for x in ppo_rollout_buffers], dim=1),
+            dones=torch.cat(tensors=[x.dones for x in ppo_rollout_buffers], dim=1),
+            truncateds=torch.cat(tensors=[x.truncateds for x in ppo_rollout_buffers], dim=1),
+            bootstrap_values=torch.cat(tensors=[x.bootstrap_values for x in ppo_rollout_buffers], dim=1),
+            valids=torch.cat(tensors=[x.valids for x in ppo_rollout_buffers], dim=1)
+        )
+
+    def add(
+        self,
+        time_step: int,
+        environment_indices: list[int],
+        input_tensors: tuple[Tensor, ...],
+        actions: Tensor,
+        log_probabilities: Tensor,
+        values: Tensor,
+        rewards: list[float],
+        dones: list[bool],
+        truncateds: list[bool]
+    ) -> None:
+        buffer_input_tensor: Tensor
+        input_tensor: Tensor
+        for buffer_input_tensor, input_tensor in zip(self.input_tensors, input_tensors):
+            buffer_input_tensor[time_step, environment_indices] = input_tensor
+        self.actions[time_step, environment_indices] = actions
+        self.log_probabilities[time_step, environment_indices] = log_probabilities
+        self.values[time_step, environment_indices] = values
+        self.rewards[time_step, environment_indices] = torch.tensor(
+            data=rewards,
+            device=self.rewards.device,
+            dtype=self.rewards.dtype
+        )
+        self.dones[time_step, environment_indices] = torch.tensor(
+            data=dones,
+            device=self.dones.device,
+            dtype=self.dones.dtype
+        )
+        self.truncateds[time_step, environment_indices] = torch.tensor(
+            data=truncateds,
+            device=self.truncateds.device,
+            dtype=self.truncateds.dtype
+        )
+        self.valids[time_step, environment_indices] = True
+
+    def add_bootstrap_values(self, time_step: int, environment_indices: list[int], bootstrap_values: Tensor) -> None:
+        self.bootstrap_values[time_step, environment_indices] = bootstrap_values
+
+    def to(self, device_: device) -> Self:
+        return type(self)(
+            input_tensors=tuple(x.to(device_) for x in self.input_tensors),
+            actions=self.actions.to(device_),
+            log_probabilities=self.log_probabilities.to(device_),
+            values=self.values.to(device_),
+            rewards=self.rewards.to(device_),
+            dones=self.dones.to(device_),
+            truncateds=self.truncateds.to(device_),
+            bootstrap_values=self.bootstrap_values.to(device_),
+            valids=self.valids.to(device_)
+        )
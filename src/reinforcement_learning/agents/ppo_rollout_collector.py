@@ -0,0 +1,146 @@
+import torch
+from torch import Tensor
+from torch.distributions import Categorical
+
+from reinforcement_learning.agents.ppo_rollout import PpoRollout
+from reinforcement_learning.agents.ppo_rollout_buffer import PpoRolloutBuffer
+from reinforcement_learning.agents.ppo_rollout_episode import PpoRolloutEpisode
+from reinforcement_learning.diagnostics.phase_timer import PhaseTimer
+from reinforcement_learning.environments.environment_state import EnvironmentState
+from reinforcement_learning.environments.vector_environment import VectorEnvironment
+from reinforcement_learning.policies.ppo_policy import PpoPolicy
+from reinforcement_learning.policies.ppo_policy_output import PpoPolicyOutput
+
+
+class PpoRolloutCollector:
+    _vector_environment: VectorEnvironment
+    _max_time_steps: int
+    _rollout_steps: int | None
+    _environment_states: list[EnvironmentState] | None
+    _episode_rewards: list[float]
+    _episode_time_steps: list[int]
+
+    def __init__(
+        self,
+        vector_environment: VectorEnvironment,
+        max_time_steps: int,
+        rollout_steps: int | None = None
+    ) -> None:
+        self._vector_environment = vector_environment
+        self._max_time_steps = max_time_steps
+        self._rollout_steps = rollout_steps
+        self._environment_states = None
+        self._episode_rewards = []
+        self._episode_time_steps = []
+
+    def __len__(self) -> int:
+        return len(self._vector_environment)
+
+    def collect_rollout(self, ppo_policy: PpoPolicy, episodes: int | None = None) -> PpoRollout:
+        # Without rollout steps every environment, or only as many as the given episodes, plays exactly one episode per
+        # rollout. Otherwise, rollouts last a fixed number of time steps and episodes carry over from one rollout to the
+        # next, resetting once finished
+        phase_timer: PhaseTimer = PhaseTimer(ppo_policy.get_device())
+        if self._rollout_steps is None or self._environment_states is None:
+            environments: int = (
+                min(episodes, len(self._vector_environment))
+                if self._rollout_steps is None and episodes is not None else len(self._vector_environment)
+            )
+            with phase_timer.measure('reset'):
+                self._environment_states = [
+                    self._vector_environment.reset_environment(environment_index=x, max_time_steps=self._max_time_steps)
+                    for x in range(environments)
+                ]
+            self._episode_rewards = [0.0] * environments
+            self._episode_time_steps = [0] * environments
+        time_steps: int = self._rollout_steps or self._max_time_steps
+        ppo_rollout_episodes: list[PpoRolloutEpisode] = []
+        active_environment_indices: list[int] = list(range(len(self._environment_states)))
+        input_tensors: tuple[Tensor, ...]
+        with phase_timer.measure('action_selection'):
+            input_tensors = ppo_policy.get_input_tensors(self._environment_states)
+        ppo_rollout_buffer: PpoRolloutBuffer = PpoRolloutBuffer.allocate(
+            time_steps=time_steps,
+            environments=len(active_environment_indices),
+            input_tensors=input_tensors
+        )
+        time_step: int
+        for time_step in range(time_steps):
+            with phase_timer.measure('action_selection'), torch.no_grad():
+                ppo_policy_output: PpoPolicyOutput = ppo_policy.forward_tensors(*input_tensors)
+                distribution: Categorical = Categorical(ppo_policy_output.action_probabilities)
+                actions: Tensor = distribution.sample()
+                agent_action_ids: list[int] = actions.tolist()
+            environment_next_states: list[EnvironmentState]
+            with phase_timer.measure('step'):
+                environment_next_states = self._vector_environment.make_step(
+                    agent_action_ids=agent_action_ids,
+                    environment_indices=active_environment_indices
+                )
+            finished_environment_indices: list[int] = []
+            truncated_environment_indices: list[int] = []
+            environment_index: int
+            environment_next_state: EnvironmentState
+            for environment_index, environment_next_state in zip(active_environment_indices, environment_next_states):
+                self._episode_rewards[environment_index] += environment_next_state.reward
+                self._episode_time_steps[environment_index] += 1
+                self._environment_states[environment_index] = environment_next_state
+                is_episode_truncated: bool = self._episode_time_steps[environment_index] >= self._max_time_steps
+                if environment_next_state.done or is_episode_truncated:
+                    finished_environment_indices.append(environment_index)
+                # The rollout end cuts running episodes short too, so their last state needs a bootstrap value
+                if not environment_next_state.done and (is_episode_truncated or time_step == time_steps - 1):
+                    truncated_environment_indices.append(environment_index)
+            ppo_rollout_buffer.add(
+                time_step=time_step,
+                environment_indices=active_environment_indices,
+                input_tensors=input_tensors,
+                actions=actions,
+                log_probabilities=distribution.log_prob(actions),
+                values=ppo_policy_output.state_values.squeeze(dim=-1),
+                rewards=[x.reward for x in environment_next_states],
+                dones=[x.done for x in environment_next_states],
+                truncateds=[x in truncated_environment_indices for x in active_environment_indices]
+            )
+            if truncated_environment_indices:
+                with phase_timer.measure('action_selection'), torch.no_grad():
+                    ppo_policy_output = ppo_policy.forward_tensors(
+                        *ppo_policy.get_input_tensors(
+                            [self._environment_states[x] for x in truncated_environment_indices]
+                        )
+                    )
+                ppo_rollout_buffer.add_bootstrap_values(
+                    time_step=time_step,
+                    environment_indices=truncated_environment_indices,
+                    bootstrap_values=ppo_policy_output.state_values.squeeze(dim=-1)
+                )
+            for environment_index in finished_environment_indices:
+                ppo_rollout_episodes.append(
+                    PpoRolloutEpisode(
+                        reward=self._episode_rewards[environment_index],
+                        summary=self._vector_environment.get_episode_summary(environment_index)
+                    )
+                )
+                if self._rollout_steps is not None:
+                    with phase_timer.measure('reset'):
+                        self._environment_states[environment_index] = self._vector_environment.reset_environment(
+                            environment_index=environment_index,
+                            max_time_steps=self._max_time_steps
+                        )
+                    self._episode_rewards[environment_index] = 0.0
+                    self._episode_time_steps[environment_index] = 0
+            if self._rollout_steps is None:
+                active_environment_indices = [
+                    x for x in active_environment_indices if x not in finished_environment_indices
+                ]
+            if not active_environment_indices or time_step == time_steps - 1:
+                break
+            with phase_timer.measure('action_selection'):
+                input_tensors = ppo_policy.get_input_tensors(
+                    [self._environment_states[x] for x in active_environment_indices]
+                )
+        return PpoRollout(
+            ppo_rollout_buffer=ppo_rollout_buffer,
+            ppo_rollout_episodes=ppo_rollout_episodes,
+            phase_seconds=phase_timer.pop_phase_seconds()
+        )
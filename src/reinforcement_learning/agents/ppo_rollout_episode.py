@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+from reinforcement_learning.environments.environment_episode_summary import EnvironmentEpisodeSummary
+
+
+@dataclass
+class PpoRolloutEpisode:
+    reward: float
+    summary: EnvironmentEpisodeSummary
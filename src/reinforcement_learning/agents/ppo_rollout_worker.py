@@ -0,0 +1,63 @@
+import logging
+from logging import Logger
+from multiprocessing.connection import Connection
+from uuid import UUID
+
+import torch
+from torch import device, Tensor
+
+from reinforcement_learning.agents.ppo_rollout import PpoRollout
+from reinforcement_learning.agents.ppo_rollout_collector import PpoRolloutCollector
+from reinforcement_learning.environments.i_environment_factory import IEnvironmentFactory
+from reinforcement_learning.environments.vector_environment import VectorEnvironment
+from reinforcement_learning.policies.i_ppo_policies_persistence import IPpoPoliciesPersistence
+from reinforcement_learning.policies.ppo_policy import PpoPolicy
+
+
+class PpoRolloutWorker:
+    _log: Logger = logging.getLogger(__name__)
+    _environment_factory: IEnvironmentFactory
+    _ppo_policies_persistence: IPpoPoliciesPersistence
+    _ppo_policy_id: UUID
+    _max_time_steps: int
+    _rollout_steps: int | None
+    _environments: int
+
+    def __init__(
+        self,
+        environment_factory: IEnvironmentFactory,
+        ppo_policies_persistence: IPpoPoliciesPersistence,
+        ppo_policy_id: UUID,
+        max_time_steps: int,
+        rollout_steps: int | None,
+        environments: int
+    ) -> None:
+        self._environment_factory = environment_factory
+        self._ppo_policies_persistence = ppo_policies_persistence
+        self._ppo_policy_id = ppo_policy_id
+        self._max_time_steps = max_time_steps
+        self._rollout_steps = rollout_steps
+        self._environments = environments
+
+    def run(self, connection: Connection) -> None:
+        torch.set_num_threads(1)  # Workers share the cores, avoid oversubscribing them
+        ppo_rollout_collector: PpoRolloutCollector = PpoRolloutCollector(
+            vector_environment=VectorEnvironment(
+                [self._environment_factory.create_environment() for _ in range(self._environments)]
+            ),
+            max_time_steps=self._max_time_steps,
+            rollout_steps=self._rollout_steps
+        )
+        ppo_policy: PpoPolicy = self._ppo_policies_persistence.load_ppo_policy(self._ppo_policy_id)
+        while True:
+            message: tuple[dict[str, Tensor], int | None] | None = connection.recv()
+            if message is None:
+                break
+            ppo_policy_state_dict: dict[str, Tensor]
+            episodes: int | None
+            ppo_policy_state_dict, episodes = message
+            ppo_policy.load_state_dict(ppo_policy_state_dict)
+            ppo_rollout: PpoRollout = ppo_rollout_collector.collect_rollout(ppo_policy=ppo_policy, episodes=episodes)
+            ppo_rollout.ppo_rollout_buffer = ppo_rollout.ppo_rollout_buffer.to(device('cpu'))
+            connection.send(ppo_rollout)
+        connection.close()
@@ -0,0 +1,125 @@
+import logging
+import multiprocessing
+from logging import Logger
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext, SpawnProcess
+from uuid import UUID
+
+from torch import Tensor
+
+from reinforcement_learning.agents.ppo_rollout import PpoRollout
+from reinforcement_learning.agents.ppo_rollout_buffer import PpoRolloutBuffer
+from reinforcement_learning.agents.ppo_rollout_worker import PpoRolloutWorker
+from reinforcement_learning.environments.i_environment_factory import IEnvironmentFactory
+from reinforcement_learning.policies.i_ppo_policies_persistence import IPpoPoliciesPersistence
+from reinforcement_learning.policies.ppo_policy import PpoPolicy
+
+
+class PpoRolloutWorkerPool:
+    _log: Logger = logging.getLogger(__name__)
+    _context: SpawnContext = multiprocessing.get_context('spawn')
+    _stop_timeout_seconds: float = 10.0
+    _ppo_rollout_worker: PpoRolloutWorker
+    _workers: int
+    _environments: int
+    _processes: list[SpawnProcess]
+    _connections: list[Connection]
+
+    def __init__(
+        self,
+        environment_factory: IEnvironmentFactory,
+        ppo_policies_persistence: IPpoPoliciesPersistence,
+        ppo_policy_id: UUID,
+        max_time_steps: int,
+        rollout_steps: int | None,
+        workers: int,
+        environments: int = 1
+    ) -> None:
+        self._ppo_rollout_worker = PpoRolloutWorker(
+            environment_factory=environment_factory,
+            ppo_policies_persistence=ppo_policies_persistence,
+            ppo_policy_id=ppo_policy_id,
+            max_time_steps=max_time_steps,
+            rollout_steps=rollout_steps,
+            environments=environments
+        )
+        self._workers = workers
+        self._environments = environments
+        self._processes = []
+        self._connections = []
+
+    def start(self) -> None:
+        self._log.debug(f'Starting {self._workers} PPO rollout workers...')
+        for _ in range(self._workers):
+            connection: Connection
+            worker_connection: Connection
+            connection, worker_connection = self._context.Pipe()
+            process: SpawnProcess = self._context.Process(
+                target=self._ppo_rollout_worker.run,
+                args=(worker_connection,),
+                daemon=True
+            )
+            process.start()
+            worker_connection.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+        self._log.debug(f'{self._workers} PPO rollout workers started')
+
+    def __len__(self) -> int:
+        return self._workers * self._environments
+
+    def collect_rollout(self, ppo_policy: PpoPolicy, episodes: int | None = None) -> PpoRollout:
+        ppo_policy_state_dict: dict[str, Tensor] = {k: v.cpu() for k, v in ppo_policy.state_dict().items()}
+        # Given episodes are played by as few workers as possible, the rest of them sitting the rollout out
+        worker_episodes: list[int | None] = (
+            [None] * self._workers if episodes is None else
+            [min(self._environments, episodes - x) for x in range(0, min(episodes, len(self)), self._environments)]
+        )
+        worker_indices: list[int] = list(range(len(worker_episodes)))
+        ppo_rollouts: list[PpoRollout] = []
+        worker_index: int
+        try:
+            for worker_index in worker_indices:
+                self._connections[worker_index].send((ppo_policy_state_dict, worker_episodes[worker_index]))
+            for worker_index in worker_indices:
+                ppo_rollouts.append(self._connections[worker_index].recv())
+        except (EOFError, OSError) as exception:
+            # A worker closing its pipe has died, taking its rollout with it
+            raise RuntimeError(self._get_dead_worker_message(worker_index)) from exception
+        return PpoRollout(
+            ppo_rollout_buffer=PpoRolloutBuffer.concatenate(
+                [x.ppo_rollout_buffer for x in ppo_rollouts]
+            ).to(ppo_policy.get_device()),
+            ppo_rollout_episodes=[y for x in ppo_rollouts for y in x.ppo_rollout_episodes],
+            # Workers run concurrently, so their mean phase seconds approximate the time each phase took
+            phase_seconds={
+                x: sum(y.phase_seconds.get(x, 0.0) for y in ppo_rollouts) / len(ppo_rollouts)
+                for x in {y for z in ppo_rollouts for y in z.phase_seconds}
+            }
+        )
+
+    def stop(self) -> None:
+        self._log.debug(f'Stopping {self._workers} PPO rollout workers...')
+        # Workers already dead cannot be told to stop, so they are only waited for, or terminated if they hang
+        connection: Connection
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        process: SpawnProcess
+        for process in self._processes:
+            process.join(timeout=self._stop_timeout_seconds)
+            if process.is_alive():
+                self._log.warning(f'PPO rollout worker \'{process.name}\' did not stop, terminating it...')
+                process.terminate()
+                process.join()
+        self._processes = []
+        self._connections = []
+        self._log.debug(f'{self._workers} PPO rollout workers stopped')
+
+    def _get_dead_worker_message(self, worker_index: int) -> str:
+        process: SpawnProcess = self._processes[worker_index]
+        process.join(timeout=self._stop_timeout_seconds)
+        return f'PPO rollout worker {worker_index} (\'{process.name}\') died with exit code {process.exitcode}'
@@ -0,0 +1,55 @@
+import logging
+from logging import Logger
+from queue import Full, Queue
+from threading import Thread
+
+from reinforcement_learning.diagnostics.i_metrics_sink import IMetricsSink
+from reinforcement_learning.diagnostics.metrics_record import MetricsRecord
+
+
+class BufferedMetricsSink(IMetricsSink):
+    _log: Logger = logging.getLogger(__name__)
+    _metrics_sink: IMetricsSink
+    _metrics_records: Queue[MetricsRecord | None]
+    _dropped_metrics_records: int
+    _writer_thread: Thread
+
+    def __init__(self, metrics_sink: IMetricsSink, max_buffered_metrics_records: int = 10000) -> None:
+        self._metrics_sink = metrics_sink
+        self._metrics_records = Queue(maxsize=max_buffered_metrics_records)
+        self._dropped_metrics_records = 0
+        self._writer_thread = Thread(target=self._write_metrics_records, name='metrics-sink-writer', daemon=True)
+        self._writer_thread.start()
+
+    def write_metrics_record(self, metrics_record: MetricsRecord) -> None:
+        # Records are dropped rather than waited for when the writer falls behind, so training is never stalled
+        try:
+            self._metrics_records.put_nowait(metrics_record)
+        except Full:
+            self._dropped_metrics_records += 1
+
+    def flush(self) -> None:
+        self._metrics_records.join()
+
+    def close(self) -> None:
+        self._metrics_records.put(None)
+        self._writer_thread.join()
+        self._metrics_sink.close()
+        if self._dropped_metrics_records > 0:
+            self._log.warning(f'{self._dropped_metrics_records} metrics records dropped by a full metrics buffer')
+
+    def _write_metrics_records(self) -> None:
+        is_closed: bool = False
+        while not is_closed:
+            metrics_record: MetricsRecord | None = self._metrics_records.get()
+            try:
+                is_closed = metrics_record is None
+                if not is_closed:
+                    self._metrics_sink.write_metrics_record(metrics_record)
+                # Flushed whenever the buffer is drained, batching writes while records keep coming
+                if is_closed or self._metrics_records.empty():
+                    self._metrics_sink.flush()
+            except Exception as exception:
+                self._log.error(f'Exception found writing metrics: {exception.__class__.__name__} - {exception}')
+            finally:
+                self._metrics_records.task_done()
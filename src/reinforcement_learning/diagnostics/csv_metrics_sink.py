@@ -0,0 +1,33 @@
+import csv
+from pathlib import Path
+from typing import Any, TextIO
+
+from reinforcement_learning.diagnostics.i_metrics_sink import IMetricsSink
+from reinforcement_learning.diagnostics.metrics_record import MetricsRecord
+
+
+class CsvMetricsSink(IMetricsSink):
+    _header: list[str] = ['created_at', 'name', 'step', 'metric', 'value']
+    _file: TextIO
+    _writer: Any
+
+    def __init__(self, path: Path) -> None:
+        # One row per metric, so records with different metrics share the same columns
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_header_pending: bool = not path.is_file() or path.stat().st_size == 0
+        self._file = path.open(mode='a', newline='')
+        self._writer = csv.writer(self._file)
+        if is_header_pending:
+            self._writer.writerow(self._header)
+
+    def write_metrics_record(self, metrics_record: MetricsRecord) -> None:
+        self._writer.writerows(
+            [metrics_record.created_at, metrics_record.name, metrics_record.step, k, v]
+            for k, v in metrics_record.metrics.items()
+        )
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
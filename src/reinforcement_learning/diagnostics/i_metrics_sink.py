@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+from reinforcement_learning.diagnostics.metrics_record import MetricsRecord
+
+
+class IMetricsSink(ABC):
+
+    @abstractmethod
+    def write_metrics_record(self, metrics_record: MetricsRecord) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+from typing import TextIO
+
+from reinforcement_learning.diagnostics.i_metrics_sink import IMetricsSink
+from reinforcement_learning.diagnostics.metrics_record import MetricsRecord
+
+
+class JsonlMetricsSink(IMetricsSink):
+    _file: TextIO
+
+    def __init__(self, path: Path) -> None:
+        # Appended to, so resumed trainings keep writing to the same file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open(mode='a')
+
+    def write_metrics_record(self, metrics_record: MetricsRecord) -> None:
+        self._file.write(
+            json.dumps(
+                {
+                    'created_at': metrics_record.created_at,
+                    'name': metrics_record.name,
+                    'step': metrics_record.step,
+                    **metrics_record.metrics
+                }
+            )
+        )
+        self._file.write('\n')
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
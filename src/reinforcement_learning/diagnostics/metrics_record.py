@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class MetricsRecord:
+    name: str
+    step: int
+    created_at: float
+    metrics: dict[str, float | int | str]
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class MetricsSinkKind(StrEnum):
+    jsonl = 'jsonl'
+    csv = 'csv'
+    tensorboard = 'tensorboard'
@@ -0,0 +1,31 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import torch
+from torch import device
+
+
+class PhaseTimer:
+    _device: device | None
+    _phase_seconds: dict[str, float]
+
+    def __init__(self, device_: device | None = None) -> None:
+        self._device = device_
+        self._phase_seconds = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        start_time: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            # CUDA kernels run asynchronously, so they are waited for to be accounted to the phase launching them
+            if self._device is not None and self._device.type == 'cuda':
+                torch.cuda.synchronize(self._device)
+            self._phase_seconds[phase] = self._phase_seconds.get(phase, 0.0) + time.perf_counter() - start_time
+
+    def pop_phase_seconds(self) -> dict[str, float]:
+        result: dict[str, float] = self._phase_seconds
+        self._phase_seconds = {}
+        return result
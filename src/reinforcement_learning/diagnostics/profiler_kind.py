@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class ProfilerKind(StrEnum):
+    cprofile = 'cprofile'
+    torch = 'torch'
@@ -0,0 +1,104 @@
+import socket
+import struct
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+from reinforcement_learning.diagnostics.i_metrics_sink import IMetricsSink
+from reinforcement_learning.diagnostics.metrics_record import MetricsRecord
+
+
+class TensorboardMetricsSink(IMetricsSink):
+    # Event files are TFRecords of serialized Event protocol buffers, written without depending on TensorBoard
+    _file_version: str = 'brain.Event:2'
+    _crc32c_table: list[int]
+    _file: BinaryIO
+
+    def __init__(self, directory: Path) -> None:
+        self._crc32c_table = self._get_crc32c_table()
+        directory.mkdir(parents=True, exist_ok=True)
+        self._file = directory.joinpath(
+            f'events.out.tfevents.{int(time.time())}.{socket.gethostname()}'
+        ).open(mode='ab')
+        self._write_event(
+            self._get_double_field(field_number=1, value=time.time()) +
+            self._get_bytes_field(field_number=3, value=self._file_version.encode())
+        )
+
+    def write_metrics_record(self, metrics_record: MetricsRecord) -> None:
+        # Only numeric metrics are plotted, grouped by record name
+        summary: bytes = b''.join(
+            self._get_bytes_field(
+                field_number=1,
+                value=(
+                    self._get_bytes_field(field_number=1, value=f'{metrics_record.name}/{k}'.encode()) +
+                    self._get_float_field(field_number=2, value=v)
+                )
+            )
+            for k, v in metrics_record.metrics.items()
+            if isinstance(v, (float, int))
+        )
+        self._write_event(
+            self._get_double_field(field_number=1, value=metrics_record.created_at) +
+            self._get_varint_field(field_number=2, value=metrics_record.step) +
+            self._get_bytes_field(field_number=5, value=summary)
+        )
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _write_event(self, event: bytes) -> None:
+        length: bytes = struct.pack('<Q', len(event))
+        self._file.write(length)
+        self._file.write(struct.pack('<I', self._get_masked_crc32c(length)))
+        self._file.write(event)
+        self._file.write(struct.pack('<I', self._get_masked_crc32c(event)))
+
+    def _get_masked_crc32c(self, data: bytes) -> int:
+        crc: int = 0xFFFFFFFF
+        byte: int
+        for byte in data:
+            crc = self._crc32c_table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+        crc ^= 0xFFFFFFFF
+        return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+    @staticmethod
+    def _get_crc32c_table() -> list[int]:
+        result: list[int] = []
+        byte: int
+        for byte in range(256):
+            crc: int = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ (0x82F63B78 if crc & 1 else 0)
+            result.append(crc)
+        return result
+
+    @classmethod
+    def _get_varint_field(cls, field_number: int, value: int) -> bytes:
+        return cls._get_varint(field_number << 3) + cls._get_varint(value)
+
+    @classmethod
+    def _get_double_field(cls, field_number: int, value: float) -> bytes:
+        return cls._get_varint((field_number << 3) | 1) + struct.pack('<d', value)
+
+    @classmethod
+    def _get_bytes_field(cls, field_number: int, value: bytes) -> bytes:
+        return cls._get_varint((field_number << 3) | 2) + cls._get_varint(len(value)) + value
+
+    @classmethod
+    def _get_float_field(cls, field_number: int, value: float) -> bytes:
+        return cls._get_varint((field_number << 3) | 5) + struct.pack('<f', value)
+
+    @staticmethod
+    def _get_varint(value: int) -> bytes:
+        # Negative values are encoded as their 64-bit two's complement
+        value &= 0xFFFFFFFFFFFFFFFF
+        result: bytearray = bytearray()
+        while value > 0x7F:
+            result.append((value & 0x7F) | 0x80)
+            value >>= 7
+        result.append(value)
+        return bytes(result)
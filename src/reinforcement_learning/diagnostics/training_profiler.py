@@ -0,0 +1,55 @@
+import cProfile
+import io
+import logging
+import pstats
+from logging import Logger
+from pathlib import Path
+
+import torch
+from torch.profiler import profile, ProfilerActivity
+
+from reinforcement_learning.diagnostics.profiler_kind import ProfilerKind
+
+
+class TrainingProfiler:
+    _log: Logger = logging.getLogger(__name__)
+    _reported_functions: int = 30
+    _profiler_kind: ProfilerKind
+    _output_path: Path
+    _profiler: cProfile.Profile | profile | None
+
+    def __init__(self, profiler_kind: ProfilerKind, name: str) -> None:
+        self._profiler_kind = profiler_kind
+        # cProfile stats are read with pstats or snakeviz, torch profiles as Chrome traces
+        self._output_path = Path(f'{name}.prof' if profiler_kind == ProfilerKind.cprofile else f'{name}.json')
+        self._profiler = None
+
+    def is_running(self) -> bool:
+        return self._profiler is not None
+
+    def start(self) -> None:
+        self._log.info(f'Starting {self._profiler_kind} profiler...')
+        if self._profiler_kind == ProfilerKind.cprofile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            activities: list[ProfilerActivity] = [ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(ProfilerActivity.CUDA)
+            self._profiler = profile(activities=activities, record_shapes=True)
+            self._profiler.__enter__()
+
+    def stop(self) -> None:
+        report: str
+        if isinstance(self._profiler, cProfile.Profile):
+            self._profiler.disable()
+            self._profiler.dump_stats(self._output_path)
+            stream: io.StringIO = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(self._reported_functions)
+            report = stream.getvalue()
+        else:
+            self._profiler.__exit__(None, None, None)
+            self._profiler.export_chrome_trace(str(self._output_path))
+            report = self._profiler.key_averages().table(sort_by='cpu_time_total', row_limit=self._reported_functions)
+        self._profiler = None
+        self._log.info(f'{self._profiler_kind} profiler stopped, profile written to \'{self._output_path}\'\n{report}')
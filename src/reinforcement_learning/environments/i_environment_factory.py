@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+from reinforcement_learning.environments.environment import Environment
+
+
+class IEnvironmentFactory(ABC):
+
+    @abstractmethod
+    def create_environment(self) -> Environment:
+        raise NotImplementedError
@@ -0,0 +1,28 @@
+from reinforcement_learning.environments.environment import Environment
+from reinforcement_learning.environments.environment_episode_summary import EnvironmentEpisodeSummary
+from reinforcement_learning.environments.environment_state import EnvironmentState
+
+
+class VectorEnvironment:
+    _environments: list[Environment]
+
+    def __init__(self, environments: list[Environment]) -> None:
+        self._environments = environments
+
+    def __len__(self) -> int:
+        return len(self._environments)
+
+    def reset(self, max_time_steps: int) -> list[EnvironmentState]:
+        return [x.reset(max_time_steps) for x in self._environments]
+
+    def reset_environment(self, environment_index: int, max_time_steps: int) -> EnvironmentState:
+        return self._environments[environment_index].reset(max_time_steps)
+
+    def make_step(self, agent_action_ids: list[int], environment_indices: list[int]) -> list[EnvironmentState]:
+        return [
+            self._environments[environment_index].make_step(agent_action_id)
+            for agent_action_id, environment_index in zip(agent_action_ids, environment_indices)
+        ]
+
+    def get_episode_summary(self, environment_index: int) -> EnvironmentEpisodeSummary:
+        return self._environments[environment_index].get_episode_summary()
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 
+from reinforcement_learning.agents.ppo_agent_checkpoint import PpoAgentCheckpoint
 from reinforcement_learning.policies.ppo_policy import PpoPolicy
 
 
@@ -13,3 +14,11 @@ class IPpoPoliciesPersistence(ABC):
     @abstractmethod
     def save_ppo_policy(self, ppo_policy: PpoPolicy) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    def load_ppo_agent_checkpoint(self, ppo_policy_id: UUID) -> PpoAgentCheckpoint | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_ppo_agent_checkpoint(self, ppo_policy_id: UUID, ppo_agent_checkpoint: PpoAgentCheckpoint) -> None:
+        raise NotImplementedError
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from uuid import UUID, uuid4
 
-from torch import device
+from torch import device, Tensor
 from torch.nn import Module
 
 from reinforcement_learning.environments.environment_state import EnvironmentState
@@ -15,8 +15,15 @@ class PpoPolicy(Module, ABC):
         super().__init__()
         self.id = id_
 
-    @abstractmethod
     def forward(self, environment_states: list[EnvironmentState]) -> PpoPolicyOutput:
+        return self.forward_tensors(*self.get_input_tensors(environment_states))
+
+    @abstractmethod
+    def forward_tensors(self, *input_tensors: Tensor) -> PpoPolicyOutput:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_input_tensors(self, environment_states: list[EnvironmentState]) -> tuple[Tensor, ...]:
         raise NotImplementedError
 
     @abstractmethod
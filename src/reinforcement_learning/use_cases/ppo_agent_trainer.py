@@ -1,36 +1,65 @@
 import logging
-from collections import deque
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict
 from logging import Logger
+from pathlib import Path
 from uuid import UUID
 
+import numpy as np
+
 from reinforcement_learning.agents.ppo_agent import PpoAgent
-from reinforcement_learning.agents.ppo_agent_selected_action import PpoAgentSelectedAction
+from reinforcement_learning.agents.ppo_agent_checkpoint import PpoAgentCheckpoint
+from reinforcement_learning.agents.ppo_agent_checkpoint_writer import PpoAgentCheckpointWriter
+from reinforcement_learning.agents.ppo_agent_update import PpoAgentUpdate
+from reinforcement_learning.agents.ppo_rollout import PpoRollout
+from reinforcement_learning.agents.ppo_rollout_collector import PpoRolloutCollector
+from reinforcement_learning.agents.ppo_rollout_episode import PpoRolloutEpisode
+from reinforcement_learning.agents.ppo_rollout_worker_pool import PpoRolloutWorkerPool
+from reinforcement_learning.diagnostics.buffered_metrics_sink import BufferedMetricsSink
+from reinforcement_learning.diagnostics.csv_metrics_sink import CsvMetricsSink
+from reinforcement_learning.diagnostics.i_metrics_sink import IMetricsSink
+from reinforcement_learning.diagnostics.jsonl_metrics_sink import JsonlMetricsSink
+from reinforcement_learning.diagnostics.metrics_record import MetricsRecord
+from reinforcement_learning.diagnostics.metrics_sink_kind import MetricsSinkKind
+from reinforcement_learning.diagnostics.phase_timer import PhaseTimer
+from reinforcement_learning.diagnostics.profiler_kind import ProfilerKind
+from reinforcement_learning.diagnostics.tensorboard_metrics_sink import TensorboardMetricsSink
+from reinforcement_learning.diagnostics.training_profiler import TrainingProfiler
 from reinforcement_learning.environments.environment import Environment
-from reinforcement_learning.environments.environment_state import EnvironmentState
+from reinforcement_learning.environments.i_environment_factory import IEnvironmentFactory
+from reinforcement_learning.environments.vector_environment import VectorEnvironment
 from reinforcement_learning.policies.i_ppo_policies_persistence import IPpoPoliciesPersistence
 from reinforcement_learning.policies.ppo_policy import PpoPolicy
 
 
 class PpoAgentTrainer:
     _log: Logger = logging.getLogger(__name__)
-    _environment: Environment
+    _phase_seconds_percentiles: list[int] = [50, 90, 99]
+    _environment: Environment | VectorEnvironment | IEnvironmentFactory
     _ppo_policies_persistence: IPpoPoliciesPersistence
     _episodes: int
     _max_time_steps: int
+    _rollout_steps: int | None
     _policy_save_rate: int
     _rewards_memory: int
     _learning_rate: float
     _gamma: float
+    _gae_lambda: float
     _eps_clip: float
     _update_epochs: int
-    _environment_states: list[EnvironmentState]
-    _ppo_agent_selected_actions: list[PpoAgentSelectedAction]
-    _rewards: list[float]
-    _dones: list[bool]
+    _minibatch_size: int | None
+    _target_kl_divergence: float | None
+    _rollout_workers: int
+    _environments: int
+    _profiled_episodes: tuple[int, int] | None
+    _profiler_kind: ProfilerKind
+    _metrics_sink_kind: MetricsSinkKind | None
+    _resume: bool
 
     def __init__(
         self,
-        environment: Environment,
+        environment: Environment | VectorEnvironment | IEnvironmentFactory,
         ppo_policies_persistence: IPpoPoliciesPersistence,
         episodes: int,
         max_time_steps: int,
@@ -38,9 +67,21 @@ class PpoAgentTrainer:
         rewards_memory: int = 100,
         learning_rate: float = 3e-4,
         gamma: float = 0.99,
+        gae_lambda: float = 1.0,
         eps_clip: float = 0.2,
-        update_epochs: int = 4
+        update_epochs: int = 4,
+        minibatch_size: int | None = None,
+        target_kl_divergence: float | None = None,
+        rollout_workers: int = 0,
+        environments: int = 1,
+        rollout_steps: int | None = None,
+        profiled_episodes: tuple[int, int] | None = None,
+        profiler_kind: ProfilerKind = ProfilerKind.cprofile,
+        metrics_sink_kind: MetricsSinkKind | None = None,
+        resume: bool = False
     ) -> None:
+        if rollout_workers > 0 and not isinstance(environment, IEnvironmentFactory):
+            raise ValueError('Rollout workers require an environment factory to create their environments')
         self._environment = environment
         self._ppo_policies_persistence = ppo_policies_persistence
         self._episodes = episodes
@@ -49,9 +90,18 @@ class PpoAgentTrainer:
         self._rewards_memory = rewards_memory
         self._learning_rate = learning_rate
         self._gamma = gamma
+        self._gae_lambda = gae_lambda
         self._eps_clip = eps_clip
         self._update_epochs = update_epochs
-        self._reset_buffer()
+        self._minibatch_size = minibatch_size
+        self._target_kl_divergence = target_kl_divergence
+        self._rollout_workers = rollout_workers
+        self._environments = environments
+        self._rollout_steps = rollout_steps
+        self._profiled_episodes = profiled_episodes
+        self._profiler_kind = profiler_kind
+        self._metrics_sink_kind = metrics_sink_kind
+        self._resume = resume
 
     def train_ppo_agent(self, ppo_policy_id: UUID) -> None:
         self._log.info(f'Training PPO agent with policy ID \'{ppo_policy_id}\'...')
@@ -62,60 +112,192 @@ class PpoAgentTrainer:
             ppo_policy_old=ppo_policy_old,
             learning_rate=self._learning_rate,
             gamma=self._gamma,
+            gae_lambda=self._gae_lambda,
             eps_clip=self._eps_clip,
-            update_epochs=self._update_epochs
+            update_epochs=self._update_epochs,
+            minibatch_size=self._minibatch_size,
+            target_kl_divergence=self._target_kl_divergence
         )
         episode_rewards: deque[float] = deque(maxlen=self._rewards_memory)
-        episode: int
-        for episode in range(self._episodes):
-            episode_reward: float = 0.0
-            environment_state: EnvironmentState = self._environment.reset(self._max_time_steps)
-            for _ in range(self._max_time_steps):
-                ppo_agent_selected_action: PpoAgentSelectedAction = ppo_agent.select_action(environment_state)
-                environment_next_state: EnvironmentState = self._environment.make_step(
-                    ppo_agent_selected_action.action_id
-                )
-                episode_reward += environment_next_state.reward
-                self._add_to_buffer(
-                    environment_state=environment_state,
-                    ppo_agent_selected_action=ppo_agent_selected_action,
-                    reward=environment_next_state.reward,
-                    done=environment_next_state.done
+        episode: int = 0
+        if self._resume:
+            ppo_agent_checkpoint: PpoAgentCheckpoint | None = self._ppo_policies_persistence.load_ppo_agent_checkpoint(
+                ppo_policy_id
+            )
+            if ppo_agent_checkpoint is not None:
+                ppo_agent.load_checkpoint(ppo_agent_checkpoint)
+                episode_rewards.extend(ppo_agent_checkpoint.episode_rewards)
+                episode = ppo_agent_checkpoint.episode
+                self._log.info(f'Resuming PPO agent training from episode {episode}')
+            else:
+                self._log.info(f'No PPO agent checkpoint for policy ID \'{ppo_policy_id}\', training from scratch')
+        ppo_rollout_collector: PpoRolloutCollector | PpoRolloutWorkerPool = self._get_ppo_rollout_collector(
+            ppo_policy_id
+        )
+        phase_timer: PhaseTimer = PhaseTimer(ppo_policy.get_device())
+        phase_seconds_history: defaultdict[str, list[float]] = defaultdict(list)
+        training_profiler: TrainingProfiler | None = (
+            TrainingProfiler(profiler_kind=self._profiler_kind, name=f'profile-{ppo_policy_id}')
+            if self._profiled_episodes is not None else None
+        )
+        metrics_sink: IMetricsSink | None = (
+            self._get_metrics_sink(f'metrics-{ppo_policy_id}') if self._metrics_sink_kind is not None else None
+        )
+        ppo_agent_checkpoint_writer: PpoAgentCheckpointWriter = PpoAgentCheckpointWriter(
+            ppo_policies_persistence=self._ppo_policies_persistence,
+            ppo_policy_id=ppo_policy_id
+        )
+        is_profiler_started: bool = False
+        if isinstance(ppo_rollout_collector, PpoRolloutWorkerPool):
+            ppo_rollout_collector.start()
+        try:
+            while episode < self._episodes:
+                # Without rollout steps each environment plays one episode, so the last rollout plays only those left
+                rollout_episodes: int | None = self._episodes - episode if self._rollout_steps is None else None
+                rollout_episodes_estimate: int = min(len(ppo_rollout_collector), self._episodes - episode)
+                # Profiling spans whole rollouts, from the first one that can finish any of the profiled episodes
+                if (
+                    training_profiler is not None and
+                    not is_profiler_started and
+                    episode < self._profiled_episodes[1] and
+                    episode + rollout_episodes_estimate > self._profiled_episodes[0]
+                ):
+                    training_profiler.start()
+                    is_profiler_started = True
+                with phase_timer.measure('rollout'):
+                    ppo_rollout: PpoRollout = ppo_rollout_collector.collect_rollout(
+                        ppo_policy=ppo_policy_old,
+                        episodes=rollout_episodes
+                    )
+                with phase_timer.measure('update'):
+                    ppo_agent_update: PpoAgentUpdate = ppo_agent.update(ppo_rollout.ppo_rollout_buffer)
+                is_policy_save_pending: bool = False
+                ppo_rollout_episode: PpoRolloutEpisode
+                # Episodes finished past the last one with rollout steps are trained on, but not counted
+                for ppo_rollout_episode in ppo_rollout.ppo_rollout_episodes[:self._episodes - episode]:
+                    episode_rewards.append(ppo_rollout_episode.reward)
+                    mean_episode_rewards: float = sum(episode_rewards) / len(episode_rewards)
+                    self._log.info(
+                        f'Episode {episode} - Reward {ppo_rollout_episode.reward:0.3f} - Mean reward '
+                        f'{mean_episode_rewards:0.3f} - {ppo_rollout_episode.summary}'
+                    )
+                    if metrics_sink is not None:
+                        metrics_sink.write_metrics_record(
+                            MetricsRecord(
+                                name='episode',
+                                step=episode,
+                                created_at=time.time(),
+                                metrics={
+                                    'reward': float(ppo_rollout_episode.reward),
+                                    'mean_reward': float(mean_episode_rewards),
+                                    **asdict(ppo_rollout_episode.summary)
+                                }
+                            )
+                        )
+                    is_policy_save_pending = is_policy_save_pending or episode % self._policy_save_rate == 0
+                    episode += 1
+                if is_policy_save_pending:
+                    with phase_timer.measure('save'):
+                        ppo_agent_checkpoint_writer.write_ppo_agent_checkpoint(
+                            ppo_agent.get_checkpoint(episode=episode, episode_rewards=list(episode_rewards))
+                        )
+                phase_seconds: dict[str, float] = {
+                    **ppo_rollout.phase_seconds,
+                    **ppo_agent_update.phase_seconds,
+                    **phase_timer.pop_phase_seconds()
+                }
+                self._log.debug(f'Timing - {self._format_phase_seconds(phase_seconds)}')
+                phase: str
+                seconds: float
+                for phase, seconds in phase_seconds.items():
+                    phase_seconds_history[phase].append(seconds)
+                if metrics_sink is not None:
+                    time_steps: int = int(ppo_rollout.ppo_rollout_buffer.valids.sum().item())
+                    metrics_sink.write_metrics_record(
+                        MetricsRecord(
+                            name='update',
+                            step=episode,
+                            created_at=time.time(),
+                            metrics={
+                                'actor_loss': ppo_agent_update.actor_loss,
+                                'critic_loss': ppo_agent_update.critic_loss,
+                                'entropy': ppo_agent_update.entropy,
+                                'approximate_kl_divergence': ppo_agent_update.approximate_kl_divergence,
+                                'time_steps': time_steps,
+                                'steps_per_second': time_steps / phase_seconds['rollout'],
+                                **{f'{k}_seconds': v for k, v in phase_seconds.items()}
+                            }
+                        )
+                    )
+                if (
+                    training_profiler is not None and
+                    training_profiler.is_running() and
+                    episode >= self._profiled_episodes[1]
+                ):
+                    training_profiler.stop()
+            if training_profiler is not None and not is_profiler_started:
+                self._log.warning(
+                    f'No rollout played profiled episodes [{self._profiled_episodes[0]}, '
+                    f'{self._profiled_episodes[1]}), training was not profiled'
                 )
-                environment_state = environment_next_state
-                if environment_state.done:
-                    break
-            ppo_agent.update(
-                environment_states=self._environment_states,
-                ppo_agent_selected_actions=self._ppo_agent_selected_actions,
-                rewards=self._rewards,
-                dones=self._dones
+        finally:
+            if training_profiler is not None and training_profiler.is_running():
+                training_profiler.stop()
+            if metrics_sink is not None:
+                metrics_sink.close()
+            # Pending checkpoints are waited for, so the last one is on disk once training completes
+            ppo_agent_checkpoint_writer.close()
+            if isinstance(ppo_rollout_collector, PpoRolloutWorkerPool):
+                ppo_rollout_collector.stop()
+        self._log_phase_seconds_percentiles(phase_seconds_history)
+        self._log.info(f'PPO agent with policy ID \'{ppo_policy_id}\' training completed')
+
+    def _get_ppo_rollout_collector(self, ppo_policy_id: UUID) -> PpoRolloutCollector | PpoRolloutWorkerPool:
+        if self._rollout_workers > 0:
+            return PpoRolloutWorkerPool(
+                environment_factory=self._environment,
+                ppo_policies_persistence=self._ppo_policies_persistence,
+                ppo_policy_id=ppo_policy_id,
+                max_time_steps=self._max_time_steps,
+                rollout_steps=self._rollout_steps,
+                workers=self._rollout_workers,
+                environments=self._environments
             )
-            self._reset_buffer()
-            episode_rewards.append(episode_reward)
-            mean_episode_rewards: float = sum(episode_rewards) / len(episode_rewards)
-            self._log.info(
-                f'Episode {episode} - Reward {episode_reward:0.3f} - Mean reward {mean_episode_rewards:0.3f} - '
-                f'{self._environment.get_episode_summary()}'
+        vector_environment: VectorEnvironment
+        if isinstance(self._environment, VectorEnvironment):
+            vector_environment = self._environment
+        elif isinstance(self._environment, IEnvironmentFactory):
+            vector_environment = VectorEnvironment(
+                [self._environment.create_environment() for _ in range(self._environments)]
             )
-            if episode % self._policy_save_rate == 0:
-                self._ppo_policies_persistence.save_ppo_policy(ppo_policy)
-        self._log.info(f'PPO agent with policy ID \'{ppo_policy_id}\' training completed')
+        else:
+            vector_environment = VectorEnvironment([self._environment])
+        return PpoRolloutCollector(
+            vector_environment=vector_environment,
+            max_time_steps=self._max_time_steps,
+            rollout_steps=self._rollout_steps
+        )
 
-    def _reset_buffer(self) -> None:
-        self._environment_states = []
-        self._ppo_agent_selected_actions = []
-        self._rewards = []
-        self._dones = []
+    def _get_metrics_sink(self, name: str) -> IMetricsSink:
+        metrics_sink: IMetricsSink
+        if self._metrics_sink_kind == MetricsSinkKind.jsonl:
+            metrics_sink = JsonlMetricsSink(Path(f'{name}.jsonl'))
+        elif self._metrics_sink_kind == MetricsSinkKind.csv:
+            metrics_sink = CsvMetricsSink(Path(f'{name}.csv'))
+        else:
+            metrics_sink = TensorboardMetricsSink(Path(name))
+        self._log.info(f'Writing {self._metrics_sink_kind} training metrics to \'{name}\'')
+        return BufferedMetricsSink(metrics_sink)
 
-    def _add_to_buffer(
-        self,
-        environment_state: EnvironmentState,
-        ppo_agent_selected_action: PpoAgentSelectedAction,
-        reward: float,
-        done: bool
-    ) -> None:
-        self._environment_states.append(environment_state)
-        self._ppo_agent_selected_actions.append(ppo_agent_selected_action)
-        self._rewards.append(reward)
-        self._dones.append(done)
+    def _log_phase_seconds_percentiles(self, phase_seconds_history: dict[str, list[float]]) -> None:
+        # Rollouts are the timing unit, as long as an episode when every rollout plays a single one
+        percentile: int
+        for percentile in self._phase_seconds_percentiles:
+            percentile_phase_seconds: dict[str, float] = {
+                k: float(np.percentile(v, percentile)) for k, v in phase_seconds_history.items()
+            }
+            self._log.info(f'Timing percentile {percentile} - {self._format_phase_seconds(percentile_phase_seconds)}')
+
+    @staticmethod
+    def _format_phase_seconds(phase_seconds: dict[str, float]) -> str:
+        return ' - '.join(f'{k} {v:0.4f}s' for k, v in phase_seconds.items())
@@ -1,12 +1,17 @@
 import logging
+from datetime import datetime, timezone
 from logging import Logger
+from pathlib import Path
 from typing import Optional
 from uuid import UUID, uuid4
 
 import typer
 from typing_extensions import Annotated
 
+from reinforcement_learning import MetricsSinkKind, ProfilerKind
+from trading_bot.candlestick.candlestick_data_download import CandlestickDataDownload
 from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.candlestick.candlestick_data_storage import CandlestickDataStorage
 from trading_bot.container import Container
 from trading_bot.use_cases.candlestick_data_downloader import CandlestickDataDownloader
 from trading_bot.use_cases.trading_ppo_agent_trainer import TradingPpoAgentTrainer
@@ -16,8 +21,8 @@ log: Logger = logging.getLogger(__name__)
 
 
 def main(
-    base_asset: Annotated[str, typer.Option(help='Base asset to work with', show_default=False)],
-    quote_asset: Annotated[str, typer.Option(help='Quote asset to work with', show_default=False)],
+    base_asset: Annotated[Optional[str], typer.Option(help='Base asset to work with', show_default=False)] = None,
+    quote_asset: Annotated[Optional[str], typer.Option(help='Quote asset to work with', show_default=False)] = None,
     ppo_policy_id: Annotated[
         Optional[UUID],
         typer.Option(help='Trading bot PPO policy ID (used for reproducibility)')
@@ -44,8 +49,102 @@ def main(
     ] = 120,
     episodes: Annotated[int, typer.Option(help='Number of episodes to train the trading bot')] = 10000,
     max_time_steps: Annotated[int, typer.Option(help='Maximum number of time steps to update the trading bot')] = 864,
+    environments: Annotated[
+        int,
+        typer.Option(help='Number of trading environments stepped in parallel during trading bot training')
+    ] = 1,
+    rollout_workers: Annotated[
+        int,
+        typer.Option(help='Number of worker processes collecting episodes in parallel (0 collects them in-process)')
+    ] = 0,
+    rollout_steps: Annotated[
+        Optional[int],
+        typer.Option(help='Number of time steps collected across episode boundaries between trading bot updates')
+    ] = None,
+    gae_lambda: Annotated[
+        float,
+        typer.Option(help='GAE lambda used to estimate advantages during trading bot training (1.0 disables GAE)')
+    ] = 1.0,
+    minibatch_size: Annotated[
+        Optional[int],
+        typer.Option(help='Number of time steps per trading bot update minibatch (a single full batch by default)')
+    ] = None,
+    target_kl_divergence: Annotated[
+        Optional[float],
+        typer.Option(
+            help='Approximate KL divergence from which trading bot update epochs stop early',
+            show_default=False
+        )
+    ] = None,
+    start_time: Annotated[
+        Optional[datetime],
+        typer.Option(help='UTC time of the first candle used during trading bot training')
+    ] = None,
+    end_time: Annotated[
+        Optional[datetime],
+        typer.Option(help='UTC time up to which candles are used during trading bot training (excluded)')
+    ] = None,
+    observation_cache_size: Annotated[
+        int,
+        typer.Option(help='Number of normalized observations cached during trading bot training (0 disables it)')
+    ] = 0,
+    precompute_observations: Annotated[
+        bool,
+        typer.Option(
+            '--precompute-observations',
+            help='Precompute every normalized observation on disk once, reusing it across trading bot trainings'
+        )
+    ] = False,
+    float16_observations: Annotated[
+        bool,
+        typer.Option('--float16-observations', help='Store precomputed observations in half precision')
+    ] = False,
+    profile_start_episode: Annotated[
+        Optional[int],
+        typer.Option(help='First episode profiled during trading bot training', show_default=False)
+    ] = None,
+    profile_end_episode: Annotated[
+        Optional[int],
+        typer.Option(help='Episode up to which trading bot training is profiled (excluded, one episode by default)')
+    ] = None,
+    profiler: Annotated[
+        ProfilerKind,
+        typer.Option(help='Profiler used over the profiled episodes')
+    ] = ProfilerKind.cprofile,
+    metrics_sink: Annotated[
+        Optional[MetricsSinkKind],
+        typer.Option(help='Sink the trading bot training metrics are written to', show_default=False)
+    ] = None,
+    max_loaded_symbols: Annotated[
+        int,
+        typer.Option(help='Number of symbols kept memory mapped at once during multi-symbol trading bot training')
+    ] = 8,
+    symbols: Annotated[
+        Optional[list[str]],
+        typer.Option(help='Symbols to download in bulk or to train on as BASE/QUOTE (repeatable)', show_default=False)
+    ] = None,
+    intervals: Annotated[
+        Optional[list[CandlestickDataInterval]],
+        typer.Option(help='Candlestick data intervals to download in bulk for every symbol (repeatable)')
+    ] = None,
+    manifest: Annotated[
+        Optional[Path],
+        typer.Option(help='JSON file listing the symbols and intervals to download in bulk', show_default=False)
+    ] = None,
+    candlestick_data_storage: Annotated[
+        CandlestickDataStorage,
+        typer.Option(help='Storage candlestick data is downloaded to and trained on')
+    ] = CandlestickDataStorage.arrow,
     download: Annotated[bool, typer.Option('--download', help='Download candlestick data')] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option('--incremental', help='Download only the candlestick data newer than the stored one')
+    ] = False,
     train: Annotated[bool, typer.Option('--train', help='Train trading bot')] = False,
+    resume: Annotated[
+        bool,
+        typer.Option('--resume', help='Resume trading bot training from its last checkpoint, optimizer state included')
+    ] = False,
 ) -> None:
     if not (download or train):
         log.error('You must specify either --download or --train.')
@@ -53,13 +152,73 @@ def main(
     elif download and train:
         log.error('Specify only one of --download or --train.')
         raise typer.Exit(code=1)
+    is_bulk_download: bool = download and (symbols is not None or manifest is not None)
+    if symbols is not None and any(len(x.split('/')) != 2 for x in symbols):
+        log.error('Symbols must be specified as BASE/QUOTE.')
+        raise typer.Exit(code=1)
+    is_multi_symbol_training: bool = train and symbols is not None
+    if not (is_bulk_download or is_multi_symbol_training) and (base_asset is None or quote_asset is None):
+        log.error('You must specify both --base-asset and --quote-asset.')
+        raise typer.Exit(code=1)
+    if is_multi_symbol_training and (observation_cache_size > 0 or precompute_observations or float16_observations):
+        log.error(
+            'Training over --symbols does not support --observation-cache-size, --precompute-observations or '
+            '--float16-observations.'
+        )
+        raise typer.Exit(code=1)
+    profiled_episodes: tuple[int, int] | None = (
+        (profile_start_episode, profile_end_episode or profile_start_episode + 1)
+        if profile_start_episode is not None else None
+    )
+    container.config.candlestick_data_storage.from_value(CandlestickDataStorage(candlestick_data_storage).value)
     log.info('Starting application...')
     try:
-        if download:
+        if is_bulk_download:
+            candlestick_data_downloads: list[CandlestickDataDownload] = [
+                CandlestickDataDownload(
+                    base_asset=x.split('/')[0],
+                    quote_asset=x.split('/')[1],
+                    interval=CandlestickDataInterval(y)
+                )
+                for x in symbols or []
+                for y in intervals or [interval]
+            ]
+            if manifest is not None:
+                candlestick_data_downloads.extend(CandlestickDataDownload.load_manifest(manifest))
+            CandlestickDataDownloader().download_candlestick_data_in_bulk(
+                candlestick_data_downloads=candlestick_data_downloads,
+                incremental=incremental
+            )
+        elif download:
             CandlestickDataDownloader().download_candlestick_data(
                 base_asset=base_asset,
                 quote_asset=quote_asset,
-                interval=CandlestickDataInterval(interval)
+                interval=CandlestickDataInterval(interval),
+                incremental=incremental
+            )
+        elif is_multi_symbol_training:
+            TradingPpoAgentTrainer().train_multi_symbol_trading_ppo_agent(
+                ppo_policy_id=ppo_policy_id if ppo_policy_id is not None else uuid4(),
+                symbols=[(x.split('/')[0], x.split('/')[1]) for x in symbols],
+                lower_interval=CandlestickDataInterval(lower_interval),
+                higher_interval=CandlestickDataInterval(higher_interval),
+                lower_interval_lookback_candles=lower_interval_lookback_candles,
+                higher_interval_lookback_candles=higher_interval_lookback_candles,
+                episodes=episodes,
+                max_time_steps=max_time_steps,
+                environments=environments,
+                rollout_workers=rollout_workers,
+                rollout_steps=rollout_steps,
+                gae_lambda=gae_lambda,
+                minibatch_size=minibatch_size,
+                target_kl_divergence=target_kl_divergence,
+                start_time=start_time.replace(tzinfo=timezone.utc) if start_time is not None else None,
+                end_time=end_time.replace(tzinfo=timezone.utc) if end_time is not None else None,
+                max_loaded_symbols=max_loaded_symbols,
+                profiled_episodes=profiled_episodes,
+                profiler_kind=ProfilerKind(profiler),
+                metrics_sink_kind=MetricsSinkKind(metrics_sink) if metrics_sink is not None else None,
+                resume=resume
             )
         elif train:
             TradingPpoAgentTrainer().train_trading_ppo_agent(
@@ -71,7 +230,22 @@ def main(
                 lower_interval_lookback_candles=lower_interval_lookback_candles,
                 higher_interval_lookback_candles=higher_interval_lookback_candles,
                 episodes=episodes,
-                max_time_steps=max_time_steps
+                max_time_steps=max_time_steps,
+                environments=environments,
+                rollout_workers=rollout_workers,
+                rollout_steps=rollout_steps,
+                gae_lambda=gae_lambda,
+                minibatch_size=minibatch_size,
+                target_kl_divergence=target_kl_divergence,
+                start_time=start_time.replace(tzinfo=timezone.utc) if start_time is not None else None,
+                end_time=end_time.replace(tzinfo=timezone.utc) if end_time is not None else None,
+                observation_cache_size=observation_cache_size,
+                precompute_observations=precompute_observations,
+                float16_observations=float16_observations,
+                profiled_episodes=profiled_episodes,
+                profiler_kind=ProfilerKind(profiler),
+                metrics_sink_kind=MetricsSinkKind(metrics_sink) if metrics_sink is not None else None,
+                resume=resume
             )
     except Exception as exception:
         log.error(f'Exception found: {exception.__class__.__name__} - {exception}')
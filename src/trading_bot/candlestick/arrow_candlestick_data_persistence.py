@@ -0,0 +1,220 @@
+import logging
+import os
+from datetime import datetime
+from hashlib import blake2b
+from logging import Logger
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+from numpy.typing import NDArray
+from pandas import DataFrame
+from pyarrow import feather, Schema, Table
+
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.candlestick.i_candlestick_data_persistence import ICandlestickDataPersistence
+from trading_bot.candlestick.pickle_candlestick_data_persistence import PickleCandlestickDataPersistence
+
+
+class ArrowCandlestickDataPersistence(ICandlestickDataPersistence):
+    _log: Logger = logging.getLogger(__name__)
+    _directory_name_template: str = 'candlestick_data_{base_asset}_{quote_asset}_{interval}'
+    _partition_filename_template: str = '{month}.arrow'
+    _fingerprint_metadata_key: bytes = b'fingerprint'
+    # Timestamps are stored as int64 milliseconds since epoch
+    _schema: Schema = pa.schema(
+        [
+            ('open_time', pa.timestamp(unit='ms', tz='UTC')),
+            ('open', pa.float32()),
+            ('high', pa.float32()),
+            ('low', pa.float32()),
+            ('close', pa.float32()),
+            ('volume', pa.float32()),
+            ('close_time', pa.timestamp(unit='ms', tz='UTC'))
+        ]
+    )
+    _data_directory: Path
+    _pickle_candlestick_data_persistence: PickleCandlestickDataPersistence
+
+    def __init__(self, data_directory: Path = Path('./data')) -> None:
+        self._data_directory = data_directory
+        self._data_directory.mkdir(parents=True, exist_ok=True)
+        self._pickle_candlestick_data_persistence = PickleCandlestickDataPersistence(data_directory)
+
+    def save_symbol_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        candlestick_data: DataFrame
+    ) -> None:
+        self._log.debug(
+            f'Saving candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\'...'
+        )
+        table: Table = Table.from_pandas(
+            df=candlestick_data[self._schema.names],
+            schema=self._schema,
+            preserve_index=False,
+            safe=False
+        )
+        directory: Path = self._get_directory(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        # One file per calendar month, so that loads of a time range only open the months it overlaps
+        months: NDArray[np.datetime64] = (
+            table.column('open_time').cast(pa.int64()).to_numpy().astype('datetime64[ms]').astype('datetime64[M]')
+        )
+        month_start_indices: NDArray[np.int64] = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        month_end_indices: NDArray[np.int64] = np.r_[month_start_indices[1:], len(months)]
+        partition_paths: list[Path] = []
+        start_index: np.int64
+        end_index: np.int64
+        for start_index, end_index in zip(month_start_indices, month_end_indices):
+            partition_path: Path = directory.joinpath(
+                self._partition_filename_template.format(month=months[start_index])
+            )
+            partition_table: Table = table.slice(offset=int(start_index), length=int(end_index - start_index))
+            fingerprint: bytes = self._get_fingerprint(partition_table)
+            # Months already stored as they are now are left untouched, so an incremental save only writes the last ones
+            if not self._is_partition_stored(partition_path=partition_path, fingerprint=fingerprint):
+                self._write_partition(
+                    partition_path=partition_path,
+                    partition_table=partition_table.replace_schema_metadata(
+                        {**(partition_table.schema.metadata or {}), self._fingerprint_metadata_key: fingerprint}
+                    )
+                )
+            partition_paths.append(partition_path)
+        stale_partition_path: Path
+        for stale_partition_path in list(directory.glob(self._partition_filename_template.format(month='*'))):
+            if stale_partition_path not in partition_paths:
+                stale_partition_path.unlink()
+        self._log.debug(
+            f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\' saved'
+        )
+
+    def load_symbol_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        columns: list[str] | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None
+    ) -> DataFrame:
+        self._log.debug(
+            f'Loading candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\'...'
+        )
+        directory: Path = self._get_directory(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        if not directory.is_dir():
+            self._convert_pickle_candlestick_data(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        table: Table = self._load_table(
+            directory=directory,
+            columns=columns,
+            start_time=start_time,
+            end_time=end_time
+        )
+        result: DataFrame = table.to_pandas(split_blocks=True)
+        self._log.debug(
+            f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\' loaded'
+        )
+        return result
+
+    def _get_directory(self, base_asset: str, quote_asset: str, interval: CandlestickDataInterval) -> Path:
+        return self._data_directory.joinpath(
+            self._directory_name_template.format(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        )
+
+    def _convert_pickle_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval
+    ) -> None:
+        # Candlestick data downloaded before Arrow partitions were used is converted once, the first time it is loaded
+        try:
+            candlestick_data: DataFrame = self._pickle_candlestick_data_persistence.load_symbol_candlestick_data(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=interval
+            )
+        except FileNotFoundError:
+            return
+        self._log.info(
+            f'Converting pickled candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\' to Arrow...'
+        )
+        self.save_symbol_candlestick_data(
+            base_asset=base_asset,
+            quote_asset=quote_asset,
+            interval=interval,
+            candlestick_data=candlestick_data
+        )
+
+    def _is_partition_stored(self, partition_path: Path, fingerprint: bytes) -> bool:
+        # Only the footer holding the schema is read, so unchanged months are recognized without reading their candles
+        if not partition_path.is_file():
+            return False
+        with pa.memory_map(str(partition_path), 'r') as source:
+            return (pa.ipc.open_file(source).schema.metadata or {}).get(self._fingerprint_metadata_key) == fingerprint
+
+    @staticmethod
+    def _get_fingerprint(table: Table) -> bytes:
+        # Digest of every column, identifying the candles a partition holds
+        digest: blake2b = blake2b(digest_size=16)
+        column: pa.ChunkedArray
+        for column in table.columns:
+            digest.update(np.ascontiguousarray(column.to_numpy()).view(np.uint8))
+        return digest.hexdigest().encode()
+
+    @staticmethod
+    def _write_partition(partition_path: Path, partition_table: Table) -> None:
+        # Written aside and renamed into place, so neither a crash nor a reader mapping the partition sees it torn.
+        # Uncompressed, so that loads can map the file instead of decoding it
+        temporary_partition_path: Path = partition_path.with_name(f'{partition_path.name}.tmp')
+        feather.write_feather(df=partition_table, dest=str(temporary_partition_path), compression='uncompressed')
+        os.replace(temporary_partition_path, partition_path)
+
+    def _load_table(
+        self,
+        directory: Path,
+        columns: list[str] | None,
+        start_time: datetime | None,
+        end_time: datetime | None
+    ) -> Table:
+        if not directory.is_dir():
+            raise FileNotFoundError(f'No candlestick data found in \'{directory}\'')
+        # Partitions are named after their month, so only the ones overlapping the time range are opened
+        start_month: np.datetime64 | None = self._get_month(start_time) if start_time is not None else None
+        end_month: np.datetime64 | None = self._get_month(end_time) if end_time is not None else None
+        partition_paths: list[Path] = sorted(
+            x for x in directory.glob(self._partition_filename_template.format(month='*'))
+            if (start_month is None or np.datetime64(x.stem) >= start_month) and
+            (end_month is None or np.datetime64(x.stem) <= end_month)
+        )
+        # Memory mapped, so that only the rows and columns projected are ever read from disk. Rows are selected by
+        # open time, from start time (inclusive) to end time (exclusive)
+        result: Table = (
+            pa.concat_tables([pa.ipc.open_file(pa.memory_map(str(x), 'r')).read_all() for x in partition_paths])
+            if partition_paths else self._schema.empty_table()
+        )
+        if start_time is not None or end_time is not None:
+            open_timestamps: NDArray[np.int64] = result.column('open_time').cast(pa.int64()).to_numpy()
+            start_index: int = (
+                int(np.searchsorted(open_timestamps, int(start_time.timestamp() * 1000)))
+                if start_time is not None else 0
+            )
+            end_index: int = (
+                int(np.searchsorted(open_timestamps, int(end_time.timestamp() * 1000)))
+                if end_time is not None else len(open_timestamps)
+            )
+            result = result.slice(offset=start_index, length=max(0, end_index - start_index))
+        if columns is not None:
+            result = result.select(columns)
+        return result
+
+    @staticmethod
+    def _get_month(time: datetime) -> np.datetime64:
+        return np.datetime64(int(time.timestamp() * 1000), 'ms').astype('datetime64[M]')
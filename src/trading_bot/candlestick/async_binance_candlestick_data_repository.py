@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from asyncio import Semaphore
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from logging import Logger
+from types import TracebackType
+from typing import Self
+
+from httpx import AsyncClient, HTTPStatusError, Limits, RequestError, Response
+from pandas import DataFrame
+
+from trading_bot.candlestick.async_rate_limiter import AsyncRateLimiter
+from trading_bot.candlestick.binance_kline_message_adapter import BinanceKlineMessageAdapter
+from trading_bot.candlestick.candlestick_data_gap_filler import CandlestickDataGapFiller
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.candlestick.i_async_candlestick_data_repository import IAsyncCandlestickDataRepository
+
+
+class AsyncBinanceCandlestickDataRepository(IAsyncCandlestickDataRepository):
+    _log: Logger = logging.getLogger(__name__)
+    _klines_path: str = '/api/v3/klines'
+    _klines_limit: int = 1000
+    _retryable_status_codes: frozenset[int] = frozenset({418, 429, 500, 502, 503, 504})
+    _binance_kline_message_adapter: BinanceKlineMessageAdapter = BinanceKlineMessageAdapter()
+    _candlestick_data_gap_filler: CandlestickDataGapFiller = CandlestickDataGapFiller()
+    _max_concurrent_requests: int
+    _requests_per_second: float
+    _sleep_seconds_between_request_failures: float
+    _max_sleep_seconds_between_request_failures: float
+    _base_url: str
+    _http_client_async: AsyncClient | None = None
+    _rate_limiter: AsyncRateLimiter | None = None
+    _semaphore: Semaphore | None = None
+
+    def __init__(
+        self,
+        max_concurrent_requests: int = 10,
+        requests_per_second: float = 20.0,
+        sleep_seconds_between_request_failures: float = 1.0,
+        max_sleep_seconds_between_request_failures: float = 60.0,
+        base_url: str = 'https://api.binance.com'
+    ) -> None:
+        self._max_concurrent_requests = max_concurrent_requests
+        self._requests_per_second = requests_per_second
+        self._sleep_seconds_between_request_failures = sleep_seconds_between_request_failures
+        self._max_sleep_seconds_between_request_failures = max_sleep_seconds_between_request_failures
+        self._base_url = base_url
+
+    async def __aenter__(self) -> Self:
+        # A single pooled client and request budget are shared by every download made within the context
+        self._http_client_async = AsyncClient(
+            base_url=self._base_url,
+            limits=Limits(max_connections=self._max_concurrent_requests)
+        )
+        self._rate_limiter = AsyncRateLimiter(self._requests_per_second)
+        self._semaphore = Semaphore(self._max_concurrent_requests)
+        return self
+
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+        await self._http_client_async.aclose()
+        self._http_client_async = None
+        self._rate_limiter = None
+        self._semaphore = None
+
+    def get_symbol_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        start_time: datetime | None = None
+    ) -> DataFrame:
+        return asyncio.run(
+            self._get_symbol_candlestick_data_in_context(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=interval,
+                start_time=start_time
+            )
+        )
+
+    async def get_symbol_candlestick_data_async(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        start_time: datetime | None = None
+    ) -> DataFrame:
+        if self._http_client_async is None:
+            raise RuntimeError('Async candlestick data repository must be entered before getting candlestick data')
+        self._log.debug(
+            f'Getting candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and interval '
+            f'\'{interval}\'...'
+        )
+        symbol: str = f'{base_asset}{quote_asset}'
+        # Unless given, the first candle ever traded bounds the windows, each of them covering exactly one request
+        start_timestamp: int
+        if start_time is not None:
+            start_timestamp = int(start_time.timestamp() * 1000)
+        else:
+            first_message: list[list[int | str]] = await self._get_message(
+                params={'symbol': symbol, 'interval': interval.value, 'startTime': 0, 'limit': 1}
+            )
+            if not first_message:
+                return self._binance_kline_message_adapter.adapt_message_to_dataframe(first_message)
+            start_timestamp = int(first_message[0][0])
+        window_milliseconds: int = int(interval.to_seconds() * 1000) * self._klines_limit
+        messages: list[list[list[int | str]]] = await asyncio.gather(
+            *[
+                self._get_message(
+                    params={
+                        'symbol': symbol,
+                        'interval': interval.value,
+                        'startTime': x,
+                        'endTime': x + window_milliseconds - 1,
+                        'limit': self._klines_limit
+                    }
+                )
+                for x in range(start_timestamp, int(time.time() * 1000), window_milliseconds)
+            ]
+        )
+        data: DataFrame = self._binance_kline_message_adapter.adapt_message_to_dataframe(
+            [y for x in messages for y in x]
+        )
+        data = data.drop_duplicates(subset='open_time', ignore_index=True)
+        data = data.sort_values(by='open_time', ascending=True, ignore_index=True)
+        data = self._candlestick_data_gap_filler.fill_missing_values(data=data, interval=interval)
+        self._log.debug(
+            f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and interval '
+            f'\'{interval}\' retrieved'
+        )
+        return data
+
+    async def _get_symbol_candlestick_data_in_context(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        start_time: datetime | None = None
+    ) -> DataFrame:
+        async with self:
+            return await self.get_symbol_candlestick_data_async(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=interval,
+                start_time=start_time
+            )
+
+    async def _get_message(self, params: dict[str, str | int]) -> list[list[int | str]]:
+        sleep_seconds: float = self._sleep_seconds_between_request_failures
+        async with self._semaphore:
+            while True:
+                await self._rate_limiter.wait()
+                retry_seconds: float = sleep_seconds
+                try:
+                    response: Response = await self._http_client_async.get(self._klines_path, params=params)
+                    response.raise_for_status()
+                    return response.json()
+                except (RequestError, HTTPStatusError) as exception:
+                    if isinstance(exception, HTTPStatusError):
+                        if exception.response.status_code not in self._retryable_status_codes:
+                            raise
+                        retry_seconds = self._get_retry_seconds(
+                            response=exception.response,
+                            default_seconds=sleep_seconds
+                        )
+                self._log.error(
+                    f'Exception found while downloading data chunk for symbol \'{params["symbol"]}\' and interval '
+                    f'\'{params["interval"]}\'. Retrying download in {retry_seconds} seconds...'
+                )
+                await asyncio.sleep(retry_seconds)
+                sleep_seconds = min(2.0 * sleep_seconds, self._max_sleep_seconds_between_request_failures)
+
+    @staticmethod
+    def _get_retry_seconds(response: Response, default_seconds: float) -> float:
+        # Retry-After holds either a number of seconds or an HTTP date, anything else falls back to the backoff delay
+        retry_after: str | None = response.headers.get('Retry-After')
+        if retry_after is None:
+            return default_seconds
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_datetime: datetime = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return default_seconds
+        if retry_datetime.tzinfo is None:
+            retry_datetime = retry_datetime.replace(tzinfo=timezone.utc)
+        return max((retry_datetime - datetime.now(timezone.utc)).total_seconds(), 0.0)
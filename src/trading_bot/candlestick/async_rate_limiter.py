@@ -0,0 +1,21 @@
+import asyncio
+from asyncio import Lock
+
+
+class AsyncRateLimiter:
+    _requests_per_second: float
+    _lock: Lock
+    _next_request_time: float
+
+    def __init__(self, requests_per_second: float) -> None:
+        self._requests_per_second = requests_per_second
+        self._lock = Lock()
+        self._next_request_time = 0.0
+
+    async def wait(self) -> None:
+        # Spaces request starts evenly, however many coroutines are waiting for their turn
+        async with self._lock:
+            now: float = asyncio.get_running_loop().time()
+            if self._next_request_time > now:
+                await asyncio.sleep(self._next_request_time - now)
+            self._next_request_time = max(now, self._next_request_time) + 1.0 / self._requests_per_second
@@ -1,12 +1,14 @@
 import logging
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from logging import Logger
 
 import pandas as pd
 from httpx import Client, RequestError, Response
 from pandas import DataFrame
 
+from trading_bot.candlestick.binance_kline_message_adapter import BinanceKlineMessageAdapter
+from trading_bot.candlestick.candlestick_data_gap_filler import CandlestickDataGapFiller
 from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
 from trading_bot.candlestick.i_candlestick_data_repository import ICandlestickDataRepository
 
@@ -14,28 +16,34 @@ from trading_bot.candlestick.i_candlestick_data_repository import ICandlestickDa
 class BinanceCandlestickDataRepository(ICandlestickDataRepository):
     _log: Logger = logging.getLogger(__name__)
     _url_template: str = (
-        'https://api.binance.com/api/v3/klines?'
+        '{base_url}/api/v3/klines?'
         'symbol={base_asset}{quote_asset}&'
         'interval={interval}&'
         'endTime={end_timestamp}&'
         'limit=1000'
     )
+    _binance_kline_message_adapter: BinanceKlineMessageAdapter = BinanceKlineMessageAdapter()
+    _candlestick_data_gap_filler: CandlestickDataGapFiller = CandlestickDataGapFiller()
     _http_client: Client
     _sleep_seconds_between_request_failures: float
+    _base_url: str
 
     def __init__(
         self,
         http_client: Client = Client(),
-        sleep_seconds_between_request_failures: float = 1.0
+        sleep_seconds_between_request_failures: float = 1.0,
+        base_url: str = 'https://api.binance.com'
     ) -> None:
         self._http_client = http_client
         self._sleep_seconds_between_request_failures = sleep_seconds_between_request_failures
+        self._base_url = base_url
 
     def get_symbol_candlestick_data(
         self,
         base_asset: str,
         quote_asset: str, 
-        interval: CandlestickDataInterval
+        interval: CandlestickDataInterval,
+        start_time: datetime | None = None
     ) -> DataFrame:
         self._log.debug(
             f'Getting candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and interval '
@@ -55,12 +63,14 @@ class BinanceCandlestickDataRepository(ICandlestickDataRepository):
             data = data.drop_duplicates(subset='open_time', ignore_index=True)
             data = data.sort_values(by='open_time', ascending=True)
             current_start_datetime: datetime = data['open_time'].iloc[0].to_pydatetime()
-            if start_datetime != current_start_datetime:
+            if start_datetime != current_start_datetime and (start_time is None or current_start_datetime > start_time):
                 start_datetime = current_start_datetime
                 end_datetime = current_start_datetime
             else:
                 break
-        result: DataFrame = self._fill_missing_values(data=data, interval_in_seconds=interval.to_seconds())
+        if start_time is not None:
+            data = data[data['open_time'] >= start_time]
+        result: DataFrame = self._candlestick_data_gap_filler.fill_missing_values(data=data, interval=interval)
         self._log.debug(
             f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and interval '
             f'\'{interval}\' retrieved'
@@ -75,6 +85,7 @@ class BinanceCandlestickDataRepository(ICandlestickDataRepository):
         end_datetime: datetime
     ) -> DataFrame:
         url: str = self._url_template.format(
+            base_url=self._base_url,
             base_asset=base_asset,
             quote_asset=quote_asset,
             interval=interval.value,
@@ -84,7 +95,7 @@ class BinanceCandlestickDataRepository(ICandlestickDataRepository):
             try:
                 response: Response = self._http_client.get(url)
                 response.raise_for_status()
-                return self._adapt_message_to_dataframe(response.json())
+                return self._binance_kline_message_adapter.adapt_message_to_dataframe(response.json())
             except RequestError:
                 self._log.error(
                     f'Exception found while downloading data chunk for base asset \'{base_asset}\', quote asset '
@@ -92,33 +103,3 @@ class BinanceCandlestickDataRepository(ICandlestickDataRepository):
                     f'{self._sleep_seconds_between_request_failures} seconds...'
                 )
                 time.sleep(self._sleep_seconds_between_request_failures)
-
-    @staticmethod
-    def _adapt_message_to_dataframe(message: list[list[int | str]]) -> DataFrame:
-        # https://binance-docs.github.io/apidocs/spot/en/#kline-candlestick-data
-        result: DataFrame = DataFrame()
-        result['open_time'] = [datetime.fromtimestamp(x[0] / 1000, tz=timezone.utc) for x in message]
-        result['open'] = [float(x[1]) for x in message]
-        result['high'] = [float(x[2]) for x in message]
-        result['low'] = [float(x[3]) for x in message]
-        result['close'] = [float(x[4]) for x in message]
-        result['volume'] = [float(x[5]) for x in message]
-        result['close_time'] = [datetime.fromtimestamp(x[6] / 1000, tz=timezone.utc) for x in message]
-        return result
-
-    @staticmethod
-    def _fill_missing_values(data: DataFrame, interval_in_seconds: float) -> DataFrame:
-        data.set_index(keys='open_time', inplace=True)
-        data = data.reindex(
-            pd.date_range(
-                start=data.index.min(),
-                end=data.index.max(),
-                freq=timedelta(seconds=interval_in_seconds),
-                tz=timezone.utc
-            )
-        )
-        data.ffill(inplace=True)
-        data['close_time'] = data.index + pd.Timedelta(seconds=interval_in_seconds)
-        data.reset_index(inplace=True)
-        data.rename(columns={'index': 'open_time'}, inplace=True)
-        return data
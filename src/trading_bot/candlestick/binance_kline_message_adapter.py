@@ -0,0 +1,31 @@
+from datetime import timezone
+
+import numpy as np
+from numpy.typing import NDArray
+from pandas import DataFrame, DatetimeIndex
+
+
+class BinanceKlineMessageAdapter:
+    _kline_fields: int = 12
+
+    def adapt_message_to_dataframe(self, message: list[list[int | str]]) -> DataFrame:
+        # https://binance-docs.github.io/apidocs/spot/en/#kline-candlestick-data
+        klines: NDArray[np.object_] = (
+            np.array(message, dtype=object) if message else np.empty(shape=(0, self._kline_fields), dtype=object)
+        )
+        prices: NDArray[np.float64] = klines[:, 1:6].astype(np.float64)
+        return DataFrame(
+            {
+                'open_time': self._adapt_timestamps_to_datetimes(klines[:, 0].astype(np.int64)),
+                'open': prices[:, 0],
+                'high': prices[:, 1],
+                'low': prices[:, 2],
+                'close': prices[:, 3],
+                'volume': prices[:, 4],
+                'close_time': self._adapt_timestamps_to_datetimes(klines[:, 6].astype(np.int64))
+            }
+        )
+
+    @staticmethod
+    def _adapt_timestamps_to_datetimes(timestamps: NDArray[np.int64]) -> DatetimeIndex:
+        return DatetimeIndex(timestamps.astype('datetime64[ms]').astype('datetime64[ns]')).tz_localize(timezone.utc)
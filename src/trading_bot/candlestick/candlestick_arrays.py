@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import ClassVar, Self
+
+import numpy as np
+from numpy.typing import NDArray
+from pandas import DataFrame, Series
+
+
+@dataclass
+class CandlestickArrays:
+    open_price_index: ClassVar[int] = 0
+    high_price_index: ClassVar[int] = 1
+    low_price_index: ClassVar[int] = 2
+    close_price_index: ClassVar[int] = 3
+    open_times: NDArray[np.int64]
+    close_times: NDArray[np.int64]
+    prices: NDArray[np.float32]
+
+    @classmethod
+    def from_dataframe(cls, candlestick_data: DataFrame) -> Self:
+        return cls(
+            open_times=cls._adapt_datetimes_to_timestamps(candlestick_data['open_time']),
+            close_times=cls._adapt_datetimes_to_timestamps(candlestick_data['close_time']),
+            prices=np.ascontiguousarray(
+                candlestick_data[['open', 'high', 'low', 'close']].to_numpy(dtype=np.float32)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.open_times)
+
+    @staticmethod
+    def _adapt_datetimes_to_timestamps(datetimes: Series) -> NDArray[np.int64]:
+        # Milliseconds since epoch, as returned by Binance
+        return np.ascontiguousarray(datetimes.to_numpy(dtype='datetime64[ms]').astype(np.int64))
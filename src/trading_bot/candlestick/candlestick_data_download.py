@@ -0,0 +1,23 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+
+
+@dataclass(frozen=True)
+class CandlestickDataDownload:
+    base_asset: str
+    quote_asset: str
+    interval: CandlestickDataInterval
+
+    @classmethod
+    def load_manifest(cls, manifest_path: Path) -> list[Self]:
+        # Manifest files list symbols as [{"base_asset": "BTC", "quote_asset": "USDT", "intervals": ["5m", "1h"]}]
+        manifest: list[dict[str, Any]] = json.loads(manifest_path.read_text())
+        return [
+            cls(base_asset=x['base_asset'], quote_asset=x['quote_asset'], interval=CandlestickDataInterval(y))
+            for x in manifest
+            for y in x['intervals']
+        ]
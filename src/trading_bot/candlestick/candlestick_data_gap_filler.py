@@ -0,0 +1,39 @@
+from datetime import timezone
+
+import numpy as np
+from numpy.typing import NDArray
+from pandas import DataFrame, DatetimeIndex
+
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+
+
+class CandlestickDataGapFiller:
+
+    def fill_missing_values(self, data: DataFrame, interval: CandlestickDataInterval) -> DataFrame:
+        # Every candle of the complete time grid takes the values of the last candle received at or before it, all
+        # worked out over integer millisecond timestamps
+        if data.empty:
+            return data
+        interval_in_milliseconds: int = int(interval.to_seconds() * 1000)
+        open_timestamps: NDArray[np.int64] = data['open_time'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+        start_timestamp: int = int(open_timestamps.min())
+        grid_offsets: NDArray[np.int64] = open_timestamps - start_timestamp
+        is_on_grid: NDArray[np.bool_] = grid_offsets % interval_in_milliseconds == 0
+        candles: int = int(grid_offsets.max() // interval_in_milliseconds) + 1
+        row_indices: NDArray[np.int64] = np.full(shape=candles, fill_value=-1, dtype=np.int64)
+        row_indices[grid_offsets[is_on_grid] // interval_in_milliseconds] = np.flatnonzero(is_on_grid)
+        row_indices = np.maximum.accumulate(row_indices)
+        grid_timestamps: NDArray[np.int64] = (
+            start_timestamp + np.arange(candles, dtype=np.int64) * interval_in_milliseconds
+        )
+        time_columns: dict[str, DatetimeIndex] = {
+            'open_time': self._adapt_timestamps_to_datetimes(grid_timestamps),
+            'close_time': self._adapt_timestamps_to_datetimes(grid_timestamps + interval_in_milliseconds)
+        }
+        return DataFrame(
+            {x: time_columns[x] if x in time_columns else data[x].to_numpy()[row_indices] for x in data.columns}
+        )
+
+    @staticmethod
+    def _adapt_timestamps_to_datetimes(timestamps: NDArray[np.int64]) -> DatetimeIndex:
+        return DatetimeIndex(timestamps.astype('datetime64[ms]').astype('datetime64[ns]')).tz_localize(timezone.utc)
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class CandlestickDataStorage(StrEnum):
+    arrow = 'arrow'
+    memmap = 'memmap'
+    pickle = 'pickle'
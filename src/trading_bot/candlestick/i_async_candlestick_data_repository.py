@@ -0,0 +1,35 @@
+from abc import abstractmethod
+from datetime import datetime
+from types import TracebackType
+from typing import Self
+
+from pandas import DataFrame
+
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.candlestick.i_candlestick_data_repository import ICandlestickDataRepository
+
+
+class IAsyncCandlestickDataRepository(ICandlestickDataRepository):
+
+    @abstractmethod
+    async def __aenter__(self) -> Self:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_symbol_candlestick_data_async(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        start_time: datetime | None = None
+    ) -> DataFrame:
+        raise NotImplementedError
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from pandas import DataFrame
 
@@ -22,6 +23,9 @@ class ICandlestickDataPersistence(ABC):
         self,
         base_asset: str,
         quote_asset: str,
-        interval: CandlestickDataInterval
+        interval: CandlestickDataInterval,
+        columns: list[str] | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None
     ) -> DataFrame:
         raise NotImplementedError
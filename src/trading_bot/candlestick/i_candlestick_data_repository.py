@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from pandas import DataFrame
 
@@ -12,6 +13,7 @@ class ICandlestickDataRepository(ABC):
         self,
         base_asset: str,
         quote_asset: str,
-        interval: CandlestickDataInterval
+        interval: CandlestickDataInterval,
+        start_time: datetime | None = None
     ) -> DataFrame:
         raise NotImplementedError
@@ -0,0 +1,210 @@
+import json
+import logging
+import os
+from datetime import datetime
+from logging import Logger
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from pandas import DataFrame, Series
+
+from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.candlestick.i_candlestick_data_persistence import ICandlestickDataPersistence
+
+
+class MemmapCandlestickDataPersistence(ICandlestickDataPersistence):
+    _log: Logger = logging.getLogger(__name__)
+    _filename_template: str = 'candlestick_data_{base_asset}_{quote_asset}_{interval}.bin'
+    # Fixed stride records, so candles are found by their offset from the first stored candle
+    _dtype: np.dtype = np.dtype(
+        [
+            ('open_time', np.int64),
+            ('open', np.float32),
+            ('high', np.float32),
+            ('low', np.float32),
+            ('close', np.float32),
+            ('volume', np.float32)
+        ]
+    )
+    _columns: list[str] = ['open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time']
+    _data_directory: Path
+
+    def __init__(self, data_directory: Path = Path('./data')) -> None:
+        self._data_directory = data_directory
+        self._data_directory.mkdir(parents=True, exist_ok=True)
+
+    def save_symbol_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        candlestick_data: DataFrame
+    ) -> None:
+        self._log.debug(
+            f'Saving candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\'...'
+        )
+        records: NDArray[Any] = self._adapt_dataframe_to_records(candlestick_data)
+        if np.any(np.diff(records['open_time']) != self._get_interval_in_milliseconds(interval)):
+            raise ValueError('Candlestick data must be gap filled to be stored with a fixed stride')
+        data_path: Path = self._get_path(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        header_path: Path = data_path.with_suffix('.json')
+        header: dict[str, str | int] = {
+            'interval': interval.value,
+            'start_time': int(records['open_time'][0]) if len(records) > 0 else 0
+        }
+        stored_candles: int = self._get_stored_candles(data_path=data_path, header_path=header_path, header=header)
+        first_changed_index: int = self._get_first_changed_index(
+            data_path=data_path,
+            stored_candles=stored_candles,
+            records=records
+        )
+        if 0 < stored_candles - 1 <= first_changed_index and stored_candles <= len(records):
+            # Only the last stored candle, usually still open when stored, and new ones are written in place
+            with data_path.open('r+b') as file:
+                file.seek(first_changed_index * self._dtype.itemsize)
+                file.write(records[first_changed_index:].tobytes())
+                file.truncate()
+        elif (
+            first_changed_index < len(records) or
+            not data_path.exists() or
+            data_path.stat().st_size != records.nbytes
+        ):
+            # Any stored candle changed, so the whole file is written aside and renamed into place
+            self._write_atomically(path=data_path, data=records.tobytes())
+            first_changed_index = 0
+        self._write_atomically(path=header_path, data=json.dumps(header).encode())
+        self._log.debug(
+            f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\' saved ({len(records) - first_changed_index} candles written)'
+        )
+
+    def load_symbol_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        columns: list[str] | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None
+    ) -> DataFrame:
+        self._log.debug(
+            f'Loading candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\'...'
+        )
+        data_path: Path = self._get_path(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        header: dict[str, str | int] = json.loads(data_path.with_suffix('.json').read_text())
+        interval_in_milliseconds: int = self._get_interval_in_milliseconds(CandlestickDataInterval(header['interval']))
+        records: NDArray[Any] = self._load_records(data_path)
+        # Start time is read from the first stored candle, as an interrupted save may leave a stale header behind
+        start_timestamp: int = int(records['open_time'][0]) if len(records) > 0 else int(header['start_time'])
+        # Rows are selected by open time, from start time (inclusive) to end time (exclusive)
+        start_index: int = (
+            self._get_index(
+                time=start_time,
+                start_timestamp=start_timestamp,
+                interval_in_milliseconds=interval_in_milliseconds,
+                candles=len(records)
+            )
+            if start_time is not None else 0
+        )
+        end_index: int = (
+            self._get_index(
+                time=end_time,
+                start_timestamp=start_timestamp,
+                interval_in_milliseconds=interval_in_milliseconds,
+                candles=len(records)
+            )
+            if end_time is not None else len(records)
+        )
+        records = records[start_index:max(start_index, end_index)]
+        result: DataFrame = DataFrame(
+            {
+                x: self._adapt_records_to_column(
+                    records=records,
+                    column=x,
+                    interval_in_milliseconds=interval_in_milliseconds
+                )
+                for x in (columns if columns is not None else self._columns)
+            }
+        )
+        self._log.debug(
+            f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\' loaded'
+        )
+        return result
+
+    def _get_path(self, base_asset: str, quote_asset: str, interval: CandlestickDataInterval) -> Path:
+        return self._data_directory.joinpath(
+            self._filename_template.format(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+        )
+
+    def _load_records(self, data_path: Path) -> NDArray[Any]:
+        # Whole records only, so the tail of an interrupted append is never read
+        candles: int = data_path.stat().st_size // self._dtype.itemsize
+        return (
+            np.memmap(data_path, dtype=self._dtype, mode='r', shape=(candles,))
+            if candles > 0 else np.empty(shape=0, dtype=self._dtype)
+        )
+
+    def _get_stored_candles(self, data_path: Path, header_path: Path, header: dict[str, str | int]) -> int:
+        # Candles stored with another interval or start time are not comparable, so they are all rewritten
+        if not (data_path.exists() and header_path.exists()) or json.loads(header_path.read_text()) != header:
+            return 0
+        return data_path.stat().st_size // self._dtype.itemsize
+
+    def _get_first_changed_index(self, data_path: Path, stored_candles: int, records: NDArray[Any]) -> int:
+        if stored_candles == 0:
+            return 0
+        stored_records: NDArray[Any] = self._load_records(data_path)
+        common_candles: int = min(stored_candles, len(records))
+        # Gap filled candles may hold NaN, compared as equal to the NaN stored for them
+        is_changed: NDArray[np.bool_] = np.zeros(shape=common_candles, dtype=np.bool_)
+        name: str
+        for name in self._dtype.names:
+            stored_values: NDArray[Any] = stored_records[name][:common_candles]
+            values: NDArray[Any] = records[name][:common_candles]
+            is_equal: NDArray[np.bool_] = stored_values == values
+            if np.issubdtype(values.dtype, np.floating):
+                is_equal |= np.isnan(stored_values) & np.isnan(values)
+            is_changed |= ~is_equal
+        changed_indices: NDArray[np.int64] = np.flatnonzero(is_changed)
+        return int(changed_indices[0]) if len(changed_indices) > 0 else common_candles
+
+    @staticmethod
+    def _write_atomically(path: Path, data: bytes) -> None:
+        # Renamed into place, so readers keep mapping the previous file until they load it again
+        temporary_path: Path = path.with_name(f'{path.name}.tmp')
+        temporary_path.write_bytes(data)
+        os.replace(temporary_path, path)
+
+    def _adapt_dataframe_to_records(self, candlestick_data: DataFrame) -> NDArray[Any]:
+        result: NDArray[Any] = np.empty(shape=len(candlestick_data), dtype=self._dtype)
+        result['open_time'] = candlestick_data['open_time'].to_numpy(dtype='datetime64[ms]').astype(np.int64)
+        name: str
+        for name in ['open', 'high', 'low', 'close', 'volume']:
+            result[name] = candlestick_data[name].to_numpy(dtype=np.float32)
+        return result
+
+    @staticmethod
+    def _adapt_records_to_column(records: NDArray[Any], column: str, interval_in_milliseconds: int) -> Series:
+        if column == 'open_time':
+            return Series(pd.to_datetime(records['open_time'], unit='ms', utc=True))
+        if column == 'close_time':
+            return Series(pd.to_datetime(records['open_time'] + interval_in_milliseconds, unit='ms', utc=True))
+        return Series(records[column])
+
+    @staticmethod
+    def _get_index(time: datetime, start_timestamp: int, interval_in_milliseconds: int, candles: int) -> int:
+        # First candle opening at or after the given time
+        return min(
+            max(-((start_timestamp - int(time.timestamp() * 1000)) // interval_in_milliseconds), 0),
+            candles
+        )
+
+    @staticmethod
+    def _get_interval_in_milliseconds(interval: CandlestickDataInterval) -> int:
+        return int(interval.to_seconds() * 1000)
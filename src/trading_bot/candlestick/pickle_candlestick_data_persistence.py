@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 from logging import Logger
 from pathlib import Path
 
@@ -43,7 +44,10 @@ class PickleCandlestickDataPersistence(ICandlestickDataPersistence):
         self,
         base_asset: str,
         quote_asset: str,
-        interval: CandlestickDataInterval
+        interval: CandlestickDataInterval,
+        columns: list[str] | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None
     ) -> DataFrame:
         self._log.debug(
             f'Loading candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
@@ -54,6 +58,14 @@ class PickleCandlestickDataPersistence(ICandlestickDataPersistence):
                 self._filename_template.format(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
             )
         )
+        # Pickles can only be read whole, so the projection is applied once loaded
+        if start_time is not None:
+            result = result[result['open_time'] >= start_time]
+        if end_time is not None:
+            result = result[result['open_time'] < end_time]
+        if columns is not None:
+            result = result[columns]
+        result = result.reset_index(drop=True)
         self._log.debug(
             f'Candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
             f'interval \'{interval}\' loaded'
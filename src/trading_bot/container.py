@@ -1,17 +1,28 @@
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
-from dependency_injector.providers import Singleton
+from dependency_injector.providers import Configuration, Selector, Singleton
 
 from reinforcement_learning import IPpoPoliciesPersistence
 from trading_bot import use_cases
-from trading_bot.candlestick.binance_candlestick_data_repository import BinanceCandlestickDataRepository
+from trading_bot.candlestick.arrow_candlestick_data_persistence import ArrowCandlestickDataPersistence
+from trading_bot.candlestick.async_binance_candlestick_data_repository import AsyncBinanceCandlestickDataRepository
+from trading_bot.candlestick.candlestick_data_storage import CandlestickDataStorage
 from trading_bot.candlestick.i_candlestick_data_persistence import ICandlestickDataPersistence
 from trading_bot.candlestick.i_candlestick_data_repository import ICandlestickDataRepository
+from trading_bot.candlestick.memmap_candlestick_data_persistence import MemmapCandlestickDataPersistence
 from trading_bot.candlestick.pickle_candlestick_data_persistence import PickleCandlestickDataPersistence
 from trading_bot.policies.local_file_trading_ppo_policies_persistence import LocalFileTradingPpoPoliciesPersistence
 
 
 class Container(DeclarativeContainer):
     wiring_config: WiringConfiguration = WiringConfiguration(packages=[use_cases])
-    candlestick_data_persistence: Singleton[ICandlestickDataPersistence] = Singleton(PickleCandlestickDataPersistence)
-    candlestick_data_repository: Singleton[ICandlestickDataRepository] = Singleton(BinanceCandlestickDataRepository)
+    config: Configuration = Configuration(default={'candlestick_data_storage': CandlestickDataStorage.arrow.value})
+    candlestick_data_persistence: Selector[ICandlestickDataPersistence] = Selector(
+        config.candlestick_data_storage,
+        arrow=Singleton(ArrowCandlestickDataPersistence),
+        memmap=Singleton(MemmapCandlestickDataPersistence),
+        pickle=Singleton(PickleCandlestickDataPersistence)
+    )
+    candlestick_data_repository: Singleton[ICandlestickDataRepository] = Singleton(
+        AsyncBinanceCandlestickDataRepository
+    )
     ppo_policies_persistence: Singleton[IPpoPoliciesPersistence] = Singleton(LocalFileTradingPpoPoliciesPersistence)
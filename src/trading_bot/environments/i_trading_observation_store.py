@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+from trading_bot.environments.trading_observation import TradingObservation
+
+
+class ITradingObservationStore(ABC):
+
+    @abstractmethod
+    def get_observation(self, lower_interval_index: int) -> TradingObservation:
+        raise NotImplementedError
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+from trading_bot.environments.i_trading_observation_store import ITradingObservationStore
+from trading_bot.environments.trading_observation import TradingObservation
+from trading_bot.environments.trading_observation_cache_statistics import TradingObservationCacheStatistics
+
+
+class LruTradingObservationCache(ITradingObservationStore):
+    _trading_observation_store: ITradingObservationStore
+    _max_observations: int
+    _observations: OrderedDict[int, TradingObservation]
+    _hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(self, trading_observation_store: ITradingObservationStore, max_observations: int) -> None:
+        self._trading_observation_store = trading_observation_store
+        self._max_observations = max_observations
+        self._observations = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_observation(self, lower_interval_index: int) -> TradingObservation:
+        # Observations only depend on the market data, so they are shared by every episode visiting the same index
+        result: TradingObservation | None = self._observations.get(lower_interval_index)
+        if result is not None:
+            self._hits += 1
+            self._observations.move_to_end(lower_interval_index)
+            return result
+        self._misses += 1
+        result = self._trading_observation_store.get_observation(lower_interval_index)
+        result.lower_interval_candlestick_data.setflags(write=False)
+        result.higher_interval_candlestick_data.setflags(write=False)
+        self._observations[lower_interval_index] = result
+        if len(self._observations) > self._max_observations:
+            self._observations.popitem(last=False)
+            self._evictions += 1
+        return result
+
+    def get_statistics(self) -> TradingObservationCacheStatistics:
+        lookups: int = self._hits + self._misses
+        return TradingObservationCacheStatistics(
+            observations=len(self._observations),
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            hit_ratio=(self._hits / lookups if lookups > 0 else 0.0)
+        )
@@ -0,0 +1,47 @@
+import random
+from dataclasses import asdict
+
+from reinforcement_learning import Environment
+from trading_bot.environments.multi_symbol_trading_environment_episode_summary import (
+    MultiSymbolTradingEnvironmentEpisodeSummary
+)
+from trading_bot.environments.trading_environment import TradingEnvironment
+from trading_bot.environments.trading_environment_state import TradingEnvironmentState
+from trading_bot.environments.trading_market_data_pool import TradingMarketDataPool
+
+
+class MultiSymbolTradingEnvironment(Environment):
+    _market_data_pool: TradingMarketDataPool
+    _lower_interval_lookback_candles: int
+    _higher_interval_lookback_candles: int
+    _current_symbol: str
+    _current_trading_environment: TradingEnvironment
+
+    def __init__(
+        self,
+        market_data_pool: TradingMarketDataPool,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int
+    ) -> None:
+        self._market_data_pool = market_data_pool
+        self._lower_interval_lookback_candles = lower_interval_lookback_candles
+        self._higher_interval_lookback_candles = higher_interval_lookback_candles
+
+    def reset(self, max_time_steps: int) -> TradingEnvironmentState:
+        # Every episode trades a randomly chosen symbol, starting at a random index of its market data
+        self._current_symbol = random.choice(self._market_data_pool.get_symbols())
+        self._current_trading_environment = TradingEnvironment(
+            market_data=self._market_data_pool.get_market_data(self._current_symbol),
+            lower_interval_lookback_candles=self._lower_interval_lookback_candles,
+            higher_interval_lookback_candles=self._higher_interval_lookback_candles
+        )
+        return self._current_trading_environment.reset(max_time_steps)
+
+    def make_step(self, agent_action_id: int) -> TradingEnvironmentState:
+        return self._current_trading_environment.make_step(agent_action_id)
+
+    def get_episode_summary(self) -> MultiSymbolTradingEnvironmentEpisodeSummary:
+        return MultiSymbolTradingEnvironmentEpisodeSummary(
+            **asdict(self._current_trading_environment.get_episode_summary()),
+            symbol=self._current_symbol
+        )
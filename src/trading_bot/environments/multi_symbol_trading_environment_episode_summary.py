@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+from trading_bot.environments.trading_environment_episode_summary import TradingEnvironmentEpisodeSummary
+
+
+@dataclass
+class MultiSymbolTradingEnvironmentEpisodeSummary(TradingEnvironmentEpisodeSummary):
+    symbol: str
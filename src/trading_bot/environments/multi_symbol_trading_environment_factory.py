@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from reinforcement_learning import IEnvironmentFactory
+from trading_bot.environments.multi_symbol_trading_environment import MultiSymbolTradingEnvironment
+from trading_bot.environments.trading_market_data_pool import TradingMarketDataPool
+
+
+class MultiSymbolTradingEnvironmentFactory(IEnvironmentFactory):
+    _market_data_directories: dict[str, Path]
+    _lower_interval_lookback_candles: int
+    _higher_interval_lookback_candles: int
+    _max_loaded_market_data: int
+
+    def __init__(
+        self,
+        market_data_directories: dict[str, Path],
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        max_loaded_market_data: int
+    ) -> None:
+        self._market_data_directories = market_data_directories
+        self._lower_interval_lookback_candles = lower_interval_lookback_candles
+        self._higher_interval_lookback_candles = higher_interval_lookback_candles
+        self._max_loaded_market_data = max_loaded_market_data
+
+    def create_environment(self) -> MultiSymbolTradingEnvironment:
+        return MultiSymbolTradingEnvironment(
+            market_data_pool=TradingMarketDataPool(
+                market_data_directories=self._market_data_directories,
+                max_loaded_market_data=self._max_loaded_market_data
+            ),
+            lower_interval_lookback_candles=self._lower_interval_lookback_candles,
+            higher_interval_lookback_candles=self._higher_interval_lookback_candles
+        )
@@ -1,32 +1,29 @@
 import random
 import statistics
 
-from pandas import DataFrame, Timestamp
-
 from reinforcement_learning import Environment
 from trading_bot.agents.trading_agent_action import TradingAgentAction
+from trading_bot.candlestick.candlestick_arrays import CandlestickArrays
+from trading_bot.environments.i_trading_observation_store import ITradingObservationStore
 from trading_bot.environments.trading_environment_episode_summary import TradingEnvironmentEpisodeSummary
 from trading_bot.environments.trading_environment_state import TradingEnvironmentState
+from trading_bot.environments.trading_market_data import TradingMarketData
+from trading_bot.environments.trading_observation import TradingObservation
+from trading_bot.environments.trading_observation_builder import TradingObservationBuilder
 
 
 class TradingEnvironment(Environment):
-    _columns_to_drop: list[str] = ['open_time', 'close_time', 'volume']
     _initial_balance: float = 1000.0
     _position_size: float = 100.0
     _trading_fee: float = 0.001
     _recent_trades_memory: int = 5
-    _lower_interval_candlestick_data: DataFrame
-    _higher_interval_candlestick_data: DataFrame
+    _market_data: TradingMarketData
+    _trading_observation_store: ITradingObservationStore
     _lower_interval_lookback_candles: int
     _higher_interval_lookback_candles: int
-    _higher_interval_close_time_column_loc: int
-    _higher_interval_close_column_loc: int
-    _higher_interval_high_column_loc: int
-    _higher_interval_low_column_loc: int
     _min_lower_interval_index: int
+    _max_lower_interval_index: int
     _current_lower_interval_index: int
-    _current_lower_interval_candlestick_data: DataFrame
-    _current_higher_interval_candlestick_data: DataFrame
     _open_position_lower_interval_index: int | None
     _current_balance: float
     _holdings: float
@@ -43,41 +40,34 @@ class TradingEnvironment(Environment):
 
     def __init__(
         self,
-        lower_interval_candlestick_data: DataFrame,
-        higher_interval_candlestick_data: DataFrame,
+        market_data: TradingMarketData,
         lower_interval_lookback_candles: int,
-        higher_interval_lookback_candles: int
+        higher_interval_lookback_candles: int,
+        trading_observation_store: ITradingObservationStore | None = None
     ) -> None:
-        self._lower_interval_candlestick_data = lower_interval_candlestick_data
-        self._higher_interval_candlestick_data = higher_interval_candlestick_data
+        self._market_data = market_data
+        self._trading_observation_store = (
+            trading_observation_store
+            if trading_observation_store is not None else
+            TradingObservationBuilder(
+                market_data=market_data,
+                lower_interval_lookback_candles=lower_interval_lookback_candles,
+                higher_interval_lookback_candles=higher_interval_lookback_candles
+            )
+        )
         self._lower_interval_lookback_candles = lower_interval_lookback_candles
         self._higher_interval_lookback_candles = higher_interval_lookback_candles
-        self._higher_interval_close_time_column_loc = self._higher_interval_candlestick_data.columns.get_loc(
-            'close_time'
-        )
-        self._higher_interval_close_column_loc = self._higher_interval_candlestick_data.columns.get_loc('close')
-        self._higher_interval_high_column_loc = self._higher_interval_candlestick_data.columns.get_loc('high')
-        self._higher_interval_low_column_loc = self._higher_interval_candlestick_data.columns.get_loc('low')
-        min_lower_interval_index: int = self._lower_interval_lookback_candles - 1
-        min_higher_interval_index: int = self._higher_interval_lookback_candles - 1
-        min_close_time: Timestamp = self._higher_interval_candlestick_data.iloc[
-            min_higher_interval_index,
-            self._higher_interval_close_time_column_loc
-        ]
-        min_lower_interval_index_imposed_by_higher_interval: int = self._lower_interval_candlestick_data[
-            self._lower_interval_candlestick_data['close_time'] == min_close_time
-        ].index.item()
-        self._min_lower_interval_index = max(
-            min_lower_interval_index,
-            min_lower_interval_index_imposed_by_higher_interval
+        self._min_lower_interval_index = market_data.get_min_lower_interval_index(
+            lower_interval_lookback_candles=lower_interval_lookback_candles,
+            higher_interval_lookback_candles=higher_interval_lookback_candles
         )
+        self._max_lower_interval_index = market_data.get_max_lower_interval_index()
 
     def reset(self, max_time_steps: int) -> TradingEnvironmentState:
         self._current_lower_interval_index = random.randint(
             a=self._min_lower_interval_index,
-            b=(len(self._lower_interval_candlestick_data) - max_time_steps - 1)
+            b=(self._max_lower_interval_index - max_time_steps)
         )
-        self._update_candlestick_data()
         self._open_position_lower_interval_index = None
         self._current_balance = self._initial_balance
         self._holdings = 0.0
@@ -93,7 +83,12 @@ class TradingEnvironment(Environment):
 
     def make_step(self, agent_action_id: int) -> TradingEnvironmentState:
         reward: float = 0.0
-        current_price: float = float(self._current_lower_interval_candlestick_data['close'].iloc[-1])
+        current_price: float = float(
+            self._market_data.lower_interval_candlestick_arrays.prices[
+                self._current_lower_interval_index,
+                CandlestickArrays.close_price_index
+            ]
+        )
         agent_action: TradingAgentAction = TradingAgentAction(agent_action_id)
         if agent_action == TradingAgentAction.open_long_position:
             if self._open_position_lower_interval_index is None:
@@ -137,7 +132,6 @@ class TradingEnvironment(Environment):
             self._steps_without_action += 1
             reward -= 0.0 * self._steps_without_action
         self._current_lower_interval_index += 1
-        self._update_candlestick_data()
         done: bool = self._open_position_lower_interval_index is None and self._current_balance <= 0.0
         self._update_current_state(reward, done)
         return self._current_state
@@ -183,66 +177,26 @@ class TradingEnvironment(Environment):
             )
         )
 
-    def _update_candlestick_data(self) -> None:
-        self._current_lower_interval_candlestick_data = self._lower_interval_candlestick_data[
-            (self._current_lower_interval_index + 1 - self._lower_interval_lookback_candles):
-            (self._current_lower_interval_index + 1)
-        ]
-        current_lower_interval_close_time: Timestamp = (
-            self._current_lower_interval_candlestick_data['close_time'].iloc[-1]
-        )
-        current_higher_interval_index: int = self._higher_interval_candlestick_data[
-            (self._higher_interval_candlestick_data['open_time'] < current_lower_interval_close_time) &
-            (current_lower_interval_close_time <= self._higher_interval_candlestick_data['close_time'])
-            ].index.item()
-        self._current_higher_interval_candlestick_data = self._higher_interval_candlestick_data[
-            (current_higher_interval_index + 1 - self._higher_interval_lookback_candles):
-            (current_higher_interval_index + 1)
-        ]
-
     def _update_current_state(self, reward: float = 0.0, done: bool = False) -> None:
-        current_lower_interval_candlestick_data: DataFrame = self._current_lower_interval_candlestick_data.copy()
-        current_higher_interval_candlestick_data: DataFrame = self._current_higher_interval_candlestick_data.copy()
-        current_higher_interval_open_time: Timestamp = (
-            current_higher_interval_candlestick_data['open_time'].iloc[-1]
-        )
-        current_higher_interval_close_time: Timestamp = (
-            current_higher_interval_candlestick_data['close_time'].iloc[-1]
-        )
-        current_higher_interval_candlestick_data.iloc[-1, self._higher_interval_close_column_loc] = (
-            current_lower_interval_candlestick_data['close'].iloc[-1]
-        )
-        current_higher_interval_candlestick_data.iloc[-1, self._higher_interval_high_column_loc] = (
-            current_lower_interval_candlestick_data[
-                (current_higher_interval_open_time <= current_lower_interval_candlestick_data['open_time']) &
-                (current_lower_interval_candlestick_data['close_time'] <= current_higher_interval_close_time)
-            ]['high'].max()
-        )
-        current_higher_interval_candlestick_data.iloc[-1, self._higher_interval_low_column_loc] = (
-            current_lower_interval_candlestick_data[
-                (current_higher_interval_open_time <= current_lower_interval_candlestick_data['open_time']) &
-                (current_lower_interval_candlestick_data['close_time'] <= current_higher_interval_close_time)
-            ]['low'].min()
-        )
-        current_lower_interval_candlestick_data.drop(columns=self._columns_to_drop, inplace=True)
-        current_higher_interval_candlestick_data.drop(columns=self._columns_to_drop, inplace=True)
-        max_high_price: float = float(current_higher_interval_candlestick_data['high'].max())
-        min_low_price: float = float(current_higher_interval_candlestick_data['low'].min())
-        delta_price: float = max_high_price - min_low_price
-        current_lower_interval_candlestick_data_normalized: DataFrame = (
-            (current_lower_interval_candlestick_data - min_low_price) / delta_price
+        trading_observation: TradingObservation = self._trading_observation_store.get_observation(
+            self._current_lower_interval_index
         )
-        current_higher_interval_candlestick_data_normalized: DataFrame = (
-            (current_higher_interval_candlestick_data - min_low_price) / delta_price
+        current_price: float = float(
+            self._market_data.lower_interval_candlestick_arrays.prices[
+                self._current_lower_interval_index,
+                CandlestickArrays.close_price_index
+            ]
         )
         is_position_open: bool
         open_position_gain_or_loss: float
         open_position_age: float
         if self._open_position_lower_interval_index is not None:
             is_position_open = True
-            current_price: float = float(self._current_lower_interval_candlestick_data['close'].iloc[-1])
             open_position_price: float = float(
-                self._lower_interval_candlestick_data['close'].iloc[self._open_position_lower_interval_index]
+                self._market_data.lower_interval_candlestick_arrays.prices[
+                    self._open_position_lower_interval_index,
+                    CandlestickArrays.close_price_index
+                ]
             )
             open_position_gain_or_loss = (current_price - open_position_price) / open_position_price
             if open_position_gain_or_loss >= 0.0:
@@ -262,8 +216,8 @@ class TradingEnvironment(Environment):
         self._current_state = TradingEnvironmentState(
             reward=reward,
             done=done,
-            lower_interval_candlestick_data=current_lower_interval_candlestick_data_normalized,
-            higher_interval_candlestick_data=current_higher_interval_candlestick_data_normalized,
+            lower_interval_candlestick_data=trading_observation.lower_interval_candlestick_data,
+            higher_interval_candlestick_data=trading_observation.higher_interval_candlestick_data,
             is_position_open=float(is_position_open),
             open_position_gain_or_loss=open_position_gain_or_loss,
             open_position_max_gain=self._open_position_max_gain,
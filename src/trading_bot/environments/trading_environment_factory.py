@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from reinforcement_learning import IEnvironmentFactory
+from trading_bot.environments.i_trading_observation_store import ITradingObservationStore
+from trading_bot.environments.lru_trading_observation_cache import LruTradingObservationCache
+from trading_bot.environments.trading_environment import TradingEnvironment
+from trading_bot.environments.trading_market_data import TradingMarketData
+from trading_bot.environments.trading_observation_builder import TradingObservationBuilder
+from trading_bot.environments.trading_observation_dataset import TradingObservationDataset
+
+
+class TradingEnvironmentFactory(IEnvironmentFactory):
+    _market_data_directory: Path
+    _lower_interval_lookback_candles: int
+    _higher_interval_lookback_candles: int
+    _observation_cache_size: int
+    _trading_observation_dataset_directory: Path | None
+
+    def __init__(
+        self,
+        market_data_directory: Path,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        observation_cache_size: int = 0,
+        trading_observation_dataset_directory: Path | None = None
+    ) -> None:
+        self._market_data_directory = market_data_directory
+        self._lower_interval_lookback_candles = lower_interval_lookback_candles
+        self._higher_interval_lookback_candles = higher_interval_lookback_candles
+        self._observation_cache_size = observation_cache_size
+        self._trading_observation_dataset_directory = trading_observation_dataset_directory
+
+    def create_environment(self) -> TradingEnvironment:
+        market_data: TradingMarketData = TradingMarketData.load(self._market_data_directory)
+        trading_observation_store: ITradingObservationStore
+        if self._trading_observation_dataset_directory is not None:
+            # Memory mapped, so every worker shares the same precomputed observations
+            trading_observation_store = TradingObservationDataset.load(self._trading_observation_dataset_directory)
+        else:
+            trading_observation_store = TradingObservationBuilder(
+                market_data=market_data,
+                lower_interval_lookback_candles=self._lower_interval_lookback_candles,
+                higher_interval_lookback_candles=self._higher_interval_lookback_candles
+            )
+        if self._observation_cache_size > 0 and isinstance(trading_observation_store, TradingObservationBuilder):
+            trading_observation_store = LruTradingObservationCache(
+                trading_observation_store=trading_observation_store,
+                max_observations=self._observation_cache_size
+            )
+        return TradingEnvironment(
+            market_data=market_data,
+            lower_interval_lookback_candles=self._lower_interval_lookback_candles,
+            higher_interval_lookback_candles=self._higher_interval_lookback_candles,
+            trading_observation_store=trading_observation_store
+        )
@@ -1,14 +1,15 @@
 from dataclasses import dataclass
 
-from pandas import DataFrame
+import numpy as np
+from numpy.typing import NDArray
 
 from reinforcement_learning import EnvironmentState
 
 
 @dataclass
 class TradingEnvironmentState(EnvironmentState):
-    lower_interval_candlestick_data: DataFrame
-    higher_interval_candlestick_data: DataFrame
+    lower_interval_candlestick_data: NDArray[np.float32]
+    higher_interval_candlestick_data: NDArray[np.float32]
     is_position_open: float
     open_position_gain_or_loss: float
     open_position_max_gain: float
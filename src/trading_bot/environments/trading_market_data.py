@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+from numpy.typing import NDArray
+from pandas import DataFrame, Series
+from pandas.api.typing import SeriesGroupBy
+
+from trading_bot.candlestick.candlestick_arrays import CandlestickArrays
+
+
+@dataclass
+class TradingMarketData:
+    lower_interval_candlestick_arrays: CandlestickArrays
+    higher_interval_candlestick_arrays: CandlestickArrays
+    higher_interval_indices: NDArray[np.int64]
+    partial_higher_interval_high_prices: NDArray[np.float32]
+    partial_higher_interval_low_prices: NDArray[np.float32]
+
+    @classmethod
+    def from_candlestick_data(
+        cls,
+        lower_interval_candlestick_data: DataFrame,
+        higher_interval_candlestick_data: DataFrame
+    ) -> Self:
+        return cls.from_candlestick_arrays(
+            lower_interval_candlestick_arrays=CandlestickArrays.from_dataframe(lower_interval_candlestick_data),
+            higher_interval_candlestick_arrays=CandlestickArrays.from_dataframe(higher_interval_candlestick_data)
+        )
+
+    @classmethod
+    def from_candlestick_arrays(
+        cls,
+        lower_interval_candlestick_arrays: CandlestickArrays,
+        higher_interval_candlestick_arrays: CandlestickArrays
+    ) -> Self:
+        higher_interval_indices: NDArray[np.int64] = cls._get_higher_interval_indices(
+            lower_interval_candlestick_arrays=lower_interval_candlestick_arrays,
+            higher_interval_candlestick_arrays=higher_interval_candlestick_arrays
+        )
+        return cls(
+            lower_interval_candlestick_arrays=lower_interval_candlestick_arrays,
+            higher_interval_candlestick_arrays=higher_interval_candlestick_arrays,
+            higher_interval_indices=higher_interval_indices,
+            partial_higher_interval_high_prices=cls._get_partial_higher_interval_prices(
+                lower_interval_prices=lower_interval_candlestick_arrays.prices[:, CandlestickArrays.high_price_index],
+                higher_interval_indices=higher_interval_indices,
+                is_high=True
+            ),
+            partial_higher_interval_low_prices=cls._get_partial_higher_interval_prices(
+                lower_interval_prices=lower_interval_candlestick_arrays.prices[:, CandlestickArrays.low_price_index],
+                higher_interval_indices=higher_interval_indices,
+                is_high=False
+            )
+        )
+
+    @classmethod
+    def load(cls, directory: Path) -> Self:
+        return cls(
+            lower_interval_candlestick_arrays=CandlestickArrays(
+                open_times=cls._load_array(directory=directory, name='lower_interval_open_times'),
+                close_times=cls._load_array(directory=directory, name='lower_interval_close_times'),
+                prices=cls._load_array(directory=directory, name='lower_interval_prices')
+            ),
+            higher_interval_candlestick_arrays=CandlestickArrays(
+                open_times=cls._load_array(directory=directory, name='higher_interval_open_times'),
+                close_times=cls._load_array(directory=directory, name='higher_interval_close_times'),
+                prices=cls._load_array(directory=directory, name='higher_interval_prices')
+            ),
+            higher_interval_indices=cls._load_array(directory=directory, name='higher_interval_indices'),
+            partial_higher_interval_high_prices=cls._load_array(
+                directory=directory,
+                name='partial_higher_interval_high_prices'
+            ),
+            partial_higher_interval_low_prices=cls._load_array(
+                directory=directory,
+                name='partial_higher_interval_low_prices'
+            )
+        )
+
+    def get_min_lower_interval_index(
+        self,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int
+    ) -> int:
+        # First lower interval candle with enough candles behind it in both intervals to fill their lookbacks
+        min_close_time: np.int64 = self.higher_interval_candlestick_arrays.close_times[
+            higher_interval_lookback_candles - 1
+        ]
+        return max(
+            lower_interval_lookback_candles - 1,
+            int(np.searchsorted(self.lower_interval_candlestick_arrays.close_times, min_close_time))
+        )
+
+    def get_max_lower_interval_index(self) -> int:
+        # Last lower interval candle enclosed by a higher interval candle
+        return int(np.flatnonzero(self.higher_interval_indices >= 0)[-1])
+
+    def get_fingerprint(self) -> str:
+        # Digest of every array, identifying data derived from this exact market data
+        digest: blake2b = blake2b(digest_size=16)
+        array: NDArray
+        for array in self._get_arrays().values():
+            digest.update(np.ascontiguousarray(array).data)
+        return digest.hexdigest()
+
+    def save(self, directory: Path) -> None:
+        name: str
+        array: NDArray
+        for name, array in self._get_arrays().items():
+            np.save(file=directory.joinpath(f'{name}.npy'), arr=array)
+
+    def _get_arrays(self) -> dict[str, NDArray]:
+        return {
+            'lower_interval_open_times': self.lower_interval_candlestick_arrays.open_times,
+            'lower_interval_close_times': self.lower_interval_candlestick_arrays.close_times,
+            'lower_interval_prices': self.lower_interval_candlestick_arrays.prices,
+            'higher_interval_open_times': self.higher_interval_candlestick_arrays.open_times,
+            'higher_interval_close_times': self.higher_interval_candlestick_arrays.close_times,
+            'higher_interval_prices': self.higher_interval_candlestick_arrays.prices,
+            'higher_interval_indices': self.higher_interval_indices,
+            'partial_higher_interval_high_prices': self.partial_higher_interval_high_prices,
+            'partial_higher_interval_low_prices': self.partial_higher_interval_low_prices
+        }
+
+    @staticmethod
+    def _load_array(directory: Path, name: str) -> NDArray:
+        # Memory mapped, so every process loading the same directory shares the same pages
+        return np.load(file=directory.joinpath(f'{name}.npy'), mmap_mode='r')
+
+    @staticmethod
+    def _get_higher_interval_indices(
+        lower_interval_candlestick_arrays: CandlestickArrays,
+        higher_interval_candlestick_arrays: CandlestickArrays
+    ) -> NDArray[np.int64]:
+        # Index of the higher interval candle enclosing each lower interval close time, or -1 if there is none
+        result: NDArray[np.int64] = np.searchsorted(
+            higher_interval_candlestick_arrays.close_times,
+            lower_interval_candlestick_arrays.close_times,
+            side='left'
+        ).astype(np.int64)
+        is_enclosed: NDArray[np.bool_] = result < len(higher_interval_candlestick_arrays)
+        is_enclosed[is_enclosed] = (
+            higher_interval_candlestick_arrays.open_times[result[is_enclosed]] <
+            lower_interval_candlestick_arrays.close_times[is_enclosed]
+        )
+        result[~is_enclosed] = -1
+        return result
+
+    @staticmethod
+    def _get_partial_higher_interval_prices(
+        lower_interval_prices: NDArray[np.float32],
+        higher_interval_indices: NDArray[np.int64],
+        is_high: bool
+    ) -> NDArray[np.float32]:
+        # Running high (or low) of the higher interval candle in progress at each lower interval candle
+        grouped_lower_interval_prices: SeriesGroupBy = Series(lower_interval_prices).groupby(higher_interval_indices)
+        result: Series = grouped_lower_interval_prices.cummax() if is_high else grouped_lower_interval_prices.cummin()
+        return result.to_numpy(dtype=np.float32)
@@ -0,0 +1,36 @@
+import logging
+from collections import OrderedDict
+from logging import Logger
+from pathlib import Path
+
+from trading_bot.environments.trading_market_data import TradingMarketData
+
+
+class TradingMarketDataPool:
+    _log: Logger = logging.getLogger(__name__)
+    _market_data_directories: dict[str, Path]
+    _max_loaded_market_data: int
+    _loaded_market_data: OrderedDict[str, TradingMarketData]
+
+    def __init__(self, market_data_directories: dict[str, Path], max_loaded_market_data: int) -> None:
+        self._market_data_directories = market_data_directories
+        self._max_loaded_market_data = max_loaded_market_data
+        self._loaded_market_data = OrderedDict()
+
+    def get_symbols(self) -> list[str]:
+        return list(self._market_data_directories)
+
+    def get_market_data(self, symbol: str) -> TradingMarketData:
+        # Market data is memory mapped when first used, dropping the least recently used one beyond the limit
+        result: TradingMarketData | None = self._loaded_market_data.get(symbol)
+        if result is not None:
+            self._loaded_market_data.move_to_end(symbol)
+            return result
+        self._log.debug(f'Loading market data for symbol \'{symbol}\'...')
+        result = TradingMarketData.load(self._market_data_directories[symbol])
+        self._loaded_market_data[symbol] = result
+        if len(self._loaded_market_data) > self._max_loaded_market_data:
+            evicted_symbol: str
+            evicted_symbol, _ = self._loaded_market_data.popitem(last=False)
+            self._log.debug(f'Market data for symbol \'{evicted_symbol}\' evicted')
+        return result
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class TradingObservation:
+    lower_interval_candlestick_data: NDArray[np.float32]
+    higher_interval_candlestick_data: NDArray[np.float32]
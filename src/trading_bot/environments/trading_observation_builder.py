@@ -0,0 +1,71 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from trading_bot.candlestick.candlestick_arrays import CandlestickArrays
+from trading_bot.environments.i_trading_observation_store import ITradingObservationStore
+from trading_bot.environments.trading_market_data import TradingMarketData
+from trading_bot.environments.trading_observation import TradingObservation
+
+
+class TradingObservationBuilder(ITradingObservationStore):
+    _market_data: TradingMarketData
+    _lower_interval_lookback_candles: int
+    _higher_interval_lookback_candles: int
+
+    def __init__(
+        self,
+        market_data: TradingMarketData,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int
+    ) -> None:
+        self._market_data = market_data
+        self._lower_interval_lookback_candles = lower_interval_lookback_candles
+        self._higher_interval_lookback_candles = higher_interval_lookback_candles
+
+    def get_observation(self, lower_interval_index: int) -> TradingObservation:
+        higher_interval_index: int = int(self._market_data.higher_interval_indices[lower_interval_index])
+        lower_interval_start_index: int = lower_interval_index + 1 - self._lower_interval_lookback_candles
+        lower_interval_end_index: int = lower_interval_index + 1
+        higher_interval_start_index: int = higher_interval_index + 1 - self._higher_interval_lookback_candles
+        higher_interval_end_index: int = higher_interval_index + 1
+        lower_interval_prices: NDArray[np.float32] = (
+            self._market_data.lower_interval_candlestick_arrays.prices[
+                lower_interval_start_index:lower_interval_end_index
+            ]
+        )
+        higher_interval_prices: NDArray[np.float32] = (
+            self._market_data.higher_interval_candlestick_arrays.prices[
+                higher_interval_start_index:higher_interval_end_index
+            ]
+        )
+        current_higher_interval_high_price: float = float(
+            self._market_data.partial_higher_interval_high_prices[lower_interval_index]
+        )
+        current_higher_interval_low_price: float = float(
+            self._market_data.partial_higher_interval_low_prices[lower_interval_index]
+        )
+        current_price: float = float(lower_interval_prices[-1, CandlestickArrays.close_price_index])
+        max_high_price: float = max(
+            float(higher_interval_prices[:-1, CandlestickArrays.high_price_index].max(initial=-np.inf)),
+            current_higher_interval_high_price
+        )
+        min_low_price: float = min(
+            float(higher_interval_prices[:-1, CandlestickArrays.low_price_index].min(initial=np.inf)),
+            current_higher_interval_low_price
+        )
+        delta_price: float = max_high_price - min_low_price
+        lower_interval_prices_normalized: NDArray[np.float32] = (lower_interval_prices - min_low_price) / delta_price
+        higher_interval_prices_normalized: NDArray[np.float32] = (higher_interval_prices - min_low_price) / delta_price
+        higher_interval_prices_normalized[-1, CandlestickArrays.high_price_index] = (
+            (current_higher_interval_high_price - min_low_price) / delta_price
+        )
+        higher_interval_prices_normalized[-1, CandlestickArrays.low_price_index] = (
+            (current_higher_interval_low_price - min_low_price) / delta_price
+        )
+        higher_interval_prices_normalized[-1, CandlestickArrays.close_price_index] = (
+            (current_price - min_low_price) / delta_price
+        )
+        return TradingObservation(
+            lower_interval_candlestick_data=lower_interval_prices_normalized.T,
+            higher_interval_candlestick_data=higher_interval_prices_normalized.T
+        )
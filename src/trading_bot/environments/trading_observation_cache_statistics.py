@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TradingObservationCacheStatistics:
+    observations: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
@@ -0,0 +1,177 @@
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar, Self
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import DTypeLike, NDArray
+
+from trading_bot.candlestick.candlestick_arrays import CandlestickArrays
+from trading_bot.environments.i_trading_observation_store import ITradingObservationStore
+from trading_bot.environments.trading_market_data import TradingMarketData
+from trading_bot.environments.trading_observation import TradingObservation
+
+
+@dataclass
+class TradingObservationDataset(ITradingObservationStore):
+    _header_filename: ClassVar[str] = 'header.json'
+    _lower_interval_filename: ClassVar[str] = 'lower_interval_candlestick_data.npy'
+    _higher_interval_filename: ClassVar[str] = 'higher_interval_candlestick_data.npy'
+    _chunk_size: ClassVar[int] = 4096
+    min_lower_interval_index: int
+    lower_interval_candlestick_data: NDArray[np.floating]
+    higher_interval_candlestick_data: NDArray[np.floating]
+
+    @classmethod
+    def build(
+        cls,
+        market_data: TradingMarketData,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        directory: Path,
+        dtype: DTypeLike = np.float32
+    ) -> Self:
+        # Observations are written chunk by chunk into memory mapped files, so histories larger than memory fit
+        min_lower_interval_index: int = market_data.get_min_lower_interval_index(
+            lower_interval_lookback_candles=lower_interval_lookback_candles,
+            higher_interval_lookback_candles=higher_interval_lookback_candles
+        )
+        observations: int = market_data.get_max_lower_interval_index() + 1 - min_lower_interval_index
+        prices: int = market_data.lower_interval_candlestick_arrays.prices.shape[1]
+        building_directory: Path = directory.with_name(f'{directory.name}.tmp')
+        shutil.rmtree(building_directory, ignore_errors=True)
+        building_directory.mkdir(parents=True)
+        lower_interval_candlestick_data: NDArray[np.floating] = np.lib.format.open_memmap(
+            filename=building_directory.joinpath(cls._lower_interval_filename),
+            mode='w+',
+            dtype=dtype,
+            shape=(observations, prices, lower_interval_lookback_candles)
+        )
+        higher_interval_candlestick_data: NDArray[np.floating] = np.lib.format.open_memmap(
+            filename=building_directory.joinpath(cls._higher_interval_filename),
+            mode='w+',
+            dtype=dtype,
+            shape=(observations, prices, higher_interval_lookback_candles)
+        )
+        start: int
+        for start in range(0, observations, cls._chunk_size):
+            end: int = min(start + cls._chunk_size, observations)
+            lower_interval_candlestick_data[start:end], higher_interval_candlestick_data[start:end] = (
+                cls._get_normalized_windows(
+                    market_data=market_data,
+                    lower_interval_lookback_candles=lower_interval_lookback_candles,
+                    higher_interval_lookback_candles=higher_interval_lookback_candles,
+                    lower_interval_indices=np.arange(min_lower_interval_index + start, min_lower_interval_index + end)
+                )
+            )
+        lower_interval_candlestick_data.flush()
+        higher_interval_candlestick_data.flush()
+        del lower_interval_candlestick_data, higher_interval_candlestick_data
+        building_directory.joinpath(cls._header_filename).write_text(
+            json.dumps({'min_lower_interval_index': min_lower_interval_index})
+        )
+        # Renamed once complete, so an interrupted build is never loaded
+        shutil.rmtree(directory, ignore_errors=True)
+        building_directory.rename(directory)
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory: Path) -> Self:
+        header: dict[str, Any] = json.loads(directory.joinpath(cls._header_filename).read_text())
+        return cls(
+            min_lower_interval_index=header['min_lower_interval_index'],
+            lower_interval_candlestick_data=np.load(
+                file=directory.joinpath(cls._lower_interval_filename),
+                mmap_mode='r'
+            ),
+            higher_interval_candlestick_data=np.load(
+                file=directory.joinpath(cls._higher_interval_filename),
+                mmap_mode='r'
+            )
+        )
+
+    @staticmethod
+    def estimate_size(
+        market_data: TradingMarketData,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        dtype: DTypeLike = np.float32
+    ) -> int:
+        observations: int = market_data.get_max_lower_interval_index() + 1 - market_data.get_min_lower_interval_index(
+            lower_interval_lookback_candles=lower_interval_lookback_candles,
+            higher_interval_lookback_candles=higher_interval_lookback_candles
+        )
+        return (
+            observations *
+            market_data.lower_interval_candlestick_arrays.prices.shape[1] *
+            (lower_interval_lookback_candles + higher_interval_lookback_candles) *
+            np.dtype(dtype).itemsize
+        )
+
+    def get_observation(self, lower_interval_index: int) -> TradingObservation:
+        index: int = lower_interval_index - self.min_lower_interval_index
+        return TradingObservation(
+            lower_interval_candlestick_data=self.lower_interval_candlestick_data[index].astype(np.float32, copy=False),
+            higher_interval_candlestick_data=self.higher_interval_candlestick_data[index].astype(np.float32, copy=False)
+        )
+
+    @staticmethod
+    def _get_normalized_windows(
+        market_data: TradingMarketData,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        lower_interval_indices: NDArray[np.int64]
+    ) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
+        # Same normalization as the trading observation builder, over a batch of lower interval indices at once
+        lower_interval_prices: NDArray[np.float32] = market_data.lower_interval_candlestick_arrays.prices
+        higher_interval_prices: NDArray[np.float32] = market_data.higher_interval_candlestick_arrays.prices
+        higher_interval_indices: NDArray[np.int64] = market_data.higher_interval_indices[lower_interval_indices]
+        current_higher_interval_high_prices: NDArray[np.float64] = (
+            market_data.partial_higher_interval_high_prices[lower_interval_indices].astype(np.float64)
+        )
+        current_higher_interval_low_prices: NDArray[np.float64] = (
+            market_data.partial_higher_interval_low_prices[lower_interval_indices].astype(np.float64)
+        )
+        current_prices: NDArray[np.float64] = (
+            lower_interval_prices[lower_interval_indices, CandlestickArrays.close_price_index].astype(np.float64)
+        )
+        # Windows are channels first, [indices, 4, lookback], as expected by the trading PPO policy
+        lower_interval_windows: NDArray[np.float32] = sliding_window_view(
+            lower_interval_prices,
+            window_shape=lower_interval_lookback_candles,
+            axis=0
+        )[lower_interval_indices + 1 - lower_interval_lookback_candles]
+        higher_interval_windows: NDArray[np.float32] = sliding_window_view(
+            higher_interval_prices,
+            window_shape=higher_interval_lookback_candles,
+            axis=0
+        )[higher_interval_indices + 1 - higher_interval_lookback_candles]
+        max_high_prices: NDArray[np.float64] = np.maximum(
+            higher_interval_windows[:, CandlestickArrays.high_price_index, :-1].max(axis=-1, initial=-np.inf),
+            current_higher_interval_high_prices
+        )
+        min_low_prices: NDArray[np.float64] = np.minimum(
+            higher_interval_windows[:, CandlestickArrays.low_price_index, :-1].min(axis=-1, initial=np.inf),
+            current_higher_interval_low_prices
+        )
+        delta_prices: NDArray[np.float64] = max_high_prices - min_low_prices
+        min_low_prices_32: NDArray[np.float32] = min_low_prices.astype(np.float32)[:, np.newaxis, np.newaxis]
+        delta_prices_32: NDArray[np.float32] = delta_prices.astype(np.float32)[:, np.newaxis, np.newaxis]
+        lower_interval_windows_normalized: NDArray[np.float32] = (
+            (lower_interval_windows - min_low_prices_32) / delta_prices_32
+        )
+        higher_interval_windows_normalized: NDArray[np.float32] = (
+            (higher_interval_windows - min_low_prices_32) / delta_prices_32
+        )
+        higher_interval_windows_normalized[:, CandlestickArrays.high_price_index, -1] = (
+            (current_higher_interval_high_prices - min_low_prices) / delta_prices
+        )
+        higher_interval_windows_normalized[:, CandlestickArrays.low_price_index, -1] = (
+            (current_higher_interval_low_prices - min_low_prices) / delta_prices
+        )
+        higher_interval_windows_normalized[:, CandlestickArrays.close_price_index, -1] = (
+            (current_prices - min_low_prices) / delta_prices
+        )
+        return lower_interval_windows_normalized, higher_interval_windows_normalized
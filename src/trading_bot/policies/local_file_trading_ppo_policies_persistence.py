@@ -1,22 +1,35 @@
 import logging
+import os
 from logging import Logger
 from pathlib import Path
+from typing import Any
 from uuid import UUID
 
 import torch
 
-from reinforcement_learning import IPpoPoliciesPersistence
+from reinforcement_learning import IPpoPoliciesPersistence, PpoAgentCheckpoint
 from trading_bot.policies.trading_ppo_policy import TradingPpoPolicy
 
 
 class LocalFileTradingPpoPoliciesPersistence(IPpoPoliciesPersistence):
     _log: Logger = logging.getLogger(__name__)
     _filename_template: str = 'ppo-policy-{ppo_policy_id}.pth'
+    # Episodes are zero padded, so checkpoints sort by name in the order they were written
+    _checkpoint_filename_template: str = 'ppo-checkpoint-{ppo_policy_id}-{episode:010d}.pth'
     _ppo_policies_directory: Path
+    _kept_ppo_agent_checkpoints: int
 
-    def __init__(self, ppo_policies_directory: Path = Path('./ppo-policies')) -> None:
+    def __init__(
+        self,
+        ppo_policies_directory: Path = Path('./ppo-policies'),
+        kept_ppo_agent_checkpoints: int = 3
+    ) -> None:
+        # The last checkpoint is always kept, as it is the one training resumes from
+        if kept_ppo_agent_checkpoints < 1:
+            raise ValueError('At least one PPO agent checkpoint must be kept')
         self._ppo_policies_directory = ppo_policies_directory
         self._ppo_policies_directory.mkdir(parents=True, exist_ok=True)
+        self._kept_ppo_agent_checkpoints = kept_ppo_agent_checkpoints
 
     def load_ppo_policy(self, ppo_policy_id: UUID) -> TradingPpoPolicy:
         self._log.debug(f'Loading trading PPO policy with ID \'{ppo_policy_id}\'...')
@@ -36,5 +49,61 @@ class LocalFileTradingPpoPoliciesPersistence(IPpoPoliciesPersistence):
         ppo_policy_file_path: Path = self._ppo_policies_directory.joinpath(
             self._filename_template.format(ppo_policy_id=ppo_policy.id)
         )
-        torch.save(obj=ppo_policy.state_dict(), f=ppo_policy_file_path)
+        self._save_atomically(obj=ppo_policy.state_dict(), file_path=ppo_policy_file_path)
         self._log.debug(f'Trading PPO policy with ID \'{ppo_policy.id}\' saved')
+
+    def load_ppo_agent_checkpoint(self, ppo_policy_id: UUID) -> PpoAgentCheckpoint | None:
+        self._log.debug(f'Loading trading PPO agent checkpoint with policy ID \'{ppo_policy_id}\'...')
+        ppo_agent_checkpoint_file_paths: list[Path] = self._get_ppo_agent_checkpoint_file_paths(ppo_policy_id)
+        if len(ppo_agent_checkpoint_file_paths) == 0:
+            self._log.debug(f'Trading PPO agent checkpoint with policy ID \'{ppo_policy_id}\' not found')
+            return None
+        result: PpoAgentCheckpoint = PpoAgentCheckpoint(
+            **torch.load(f=ppo_agent_checkpoint_file_paths[-1], weights_only=True)
+        )
+        self._log.debug(
+            f'Trading PPO agent checkpoint with policy ID \'{ppo_policy_id}\' at episode {result.episode} loaded'
+        )
+        return result
+
+    def save_ppo_agent_checkpoint(self, ppo_policy_id: UUID, ppo_agent_checkpoint: PpoAgentCheckpoint) -> None:
+        self._log.debug(
+            f'Saving trading PPO agent checkpoint with policy ID \'{ppo_policy_id}\' at episode '
+            f'{ppo_agent_checkpoint.episode}...'
+        )
+        self._save_atomically(
+            obj=vars(ppo_agent_checkpoint),
+            file_path=self._ppo_policies_directory.joinpath(
+                self._checkpoint_filename_template.format(
+                    ppo_policy_id=ppo_policy_id,
+                    episode=ppo_agent_checkpoint.episode
+                )
+            )
+        )
+        # The policy alone is kept up to date too, as loaded by rollout workers and later trainings
+        self._save_atomically(
+            obj=ppo_agent_checkpoint.ppo_policy_state_dict,
+            file_path=self._ppo_policies_directory.joinpath(self._filename_template.format(ppo_policy_id=ppo_policy_id))
+        )
+        ppo_agent_checkpoint_file_path: Path
+        for ppo_agent_checkpoint_file_path in (
+            self._get_ppo_agent_checkpoint_file_paths(ppo_policy_id)[:-self._kept_ppo_agent_checkpoints]
+        ):
+            ppo_agent_checkpoint_file_path.unlink(missing_ok=True)
+        self._log.debug(
+            f'Trading PPO agent checkpoint with policy ID \'{ppo_policy_id}\' at episode '
+            f'{ppo_agent_checkpoint.episode} saved'
+        )
+
+    def _get_ppo_agent_checkpoint_file_paths(self, ppo_policy_id: UUID) -> list[Path]:
+        return sorted(self._ppo_policies_directory.glob(f'ppo-checkpoint-{ppo_policy_id}-*.pth'))
+
+    @staticmethod
+    def _save_atomically(obj: Any, file_path: Path) -> None:
+        # Written aside and renamed once synced, so a killed process never leaves a truncated file behind
+        temporary_file_path: Path = file_path.with_name(f'{file_path.name}.tmp')
+        with temporary_file_path.open(mode='wb') as file:
+            torch.save(obj=obj, f=file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_file_path, file_path)
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+import numpy as np
 import torch
 from torch import device, Tensor
 from torch.nn import Conv1d, Linear, ReLU, Sequential, Softmax
@@ -78,8 +79,21 @@ class TradingPpoPolicy(PpoPolicy):
         )
         self.to(self._device)
 
-    def forward(self, environment_states: list[TradingEnvironmentState]) -> PpoPolicyOutput:
-        shared_features: Tensor = torch.stack([self._get_shared_features(x) for x in environment_states])
+    def forward_tensors(
+        self,
+        higher_interval_candlestick_data: Tensor,
+        lower_interval_candlestick_data: Tensor,
+        non_candlestick_data: Tensor
+    ) -> PpoPolicyOutput:
+        trading_environment_state_input_tensor: Tensor = torch.cat(
+            [
+                self._higher_interval_candlestick_data_layers(higher_interval_candlestick_data).squeeze(dim=-1),
+                self._lower_interval_candlestick_data_layers(lower_interval_candlestick_data).squeeze(dim=-1),
+                non_candlestick_data
+            ],
+            dim=-1
+        )
+        shared_features: Tensor = self._trading_environment_state_layers(trading_environment_state_input_tensor)
         return PpoPolicyOutput(
             action_probabilities=self._actor(shared_features),
             state_values=self._critic(shared_features)
@@ -88,38 +102,27 @@ class TradingPpoPolicy(PpoPolicy):
     def get_device(self) -> device:
         return self._device
 
-    def _get_shared_features(self, environment_state: TradingEnvironmentState) -> Tensor:
-        higher_interval_candlestick_data_features: Tensor = self._higher_interval_candlestick_data_layers(
-            torch.tensor(
-                data=environment_state.higher_interval_candlestick_data.values.T,
-                device=self._device,
-                dtype=torch.float32
-            )
-        )
-        lower_interval_candlestick_data_features: Tensor = self._lower_interval_candlestick_data_layers(
-            torch.tensor(
-                data=environment_state.lower_interval_candlestick_data.values.T,
-                device=self._device,
-                dtype=torch.float32
-            )
-        )
-        trading_environment_state_input_tensor: Tensor = torch.cat(
-            [
-                higher_interval_candlestick_data_features.squeeze(),
-                lower_interval_candlestick_data_features.squeeze(),
-                torch.tensor(
-                    data=[
-                        environment_state.is_position_open,
-                        environment_state.open_position_gain_or_loss,
-                        environment_state.open_position_max_gain,
-                        environment_state.open_position_max_loss,
-                        environment_state.open_position_age,
-                        environment_state.steps_without_action,
-                        environment_state.recent_win_ratio
-                    ],
-                    device=self._device,
-                    dtype=torch.float32
-                )
-            ]
+    def get_input_tensors(self, environment_states: list[TradingEnvironmentState]) -> tuple[Tensor, Tensor, Tensor]:
+        higher_interval_candlestick_data: Tensor = torch.from_numpy(
+            np.stack([x.higher_interval_candlestick_data for x in environment_states])
+        ).to(device=self._device, dtype=torch.float32)
+        lower_interval_candlestick_data: Tensor = torch.from_numpy(
+            np.stack([x.lower_interval_candlestick_data for x in environment_states])
+        ).to(device=self._device, dtype=torch.float32)
+        non_candlestick_data: Tensor = torch.tensor(
+            data=[
+                [
+                    x.is_position_open,
+                    x.open_position_gain_or_loss,
+                    x.open_position_max_gain,
+                    x.open_position_max_loss,
+                    x.open_position_age,
+                    x.steps_without_action,
+                    x.recent_win_ratio
+                ]
+                for x in environment_states
+            ],
+            device=self._device,
+            dtype=torch.float32
         )
-        return self._trading_environment_state_layers(trading_environment_state_input_tensor)
+        return higher_interval_candlestick_data, lower_interval_candlestick_data, non_candlestick_data
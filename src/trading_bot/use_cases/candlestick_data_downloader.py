@@ -1,15 +1,23 @@
+import asyncio
 import logging
+from datetime import datetime
 from logging import Logger
 
+import pandas as pd
 from dependency_injector.wiring import inject, Provide
+from pandas import DataFrame
 
+from trading_bot.candlestick.candlestick_data_download import CandlestickDataDownload
+from trading_bot.candlestick.candlestick_data_gap_filler import CandlestickDataGapFiller
 from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
+from trading_bot.candlestick.i_async_candlestick_data_repository import IAsyncCandlestickDataRepository
 from trading_bot.candlestick.i_candlestick_data_persistence import ICandlestickDataPersistence
 from trading_bot.candlestick.i_candlestick_data_repository import ICandlestickDataRepository
 
 
 class CandlestickDataDownloader:
     _log: Logger = logging.getLogger(__name__)
+    _candlestick_data_gap_filler: CandlestickDataGapFiller = CandlestickDataGapFiller()
     _candlestick_data_persistence: ICandlestickDataPersistence
     _candlestick_data_repository: ICandlestickDataRepository
 
@@ -22,22 +30,188 @@ class CandlestickDataDownloader:
         self._candlestick_data_persistence = candlestick_data_persistence
         self._candlestick_data_repository = candlestick_data_repository
 
-    def download_candlestick_data(self, base_asset: str, quote_asset: str, interval: CandlestickDataInterval) -> None:
+    def download_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        incremental: bool = False
+    ) -> None:
         self._log.info(
             f'Downloading candlestick data for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
             f'interval \'{interval}\'...'
         )
-        self._candlestick_data_persistence.save_symbol_candlestick_data(
+        stored_candlestick_data: DataFrame | None = (
+            self._load_stored_candlestick_data(base_asset=base_asset, quote_asset=quote_asset, interval=interval)
+            if incremental else None
+        )
+        start_time: datetime | None = self._get_start_time(stored_candlestick_data)
+        self._save_candlestick_data(
             base_asset=base_asset,
             quote_asset=quote_asset,
             interval=interval,
-            candlestick_data=self._candlestick_data_repository.get_symbol_candlestick_data(
+            stored_candlestick_data=stored_candlestick_data,
+            new_candlestick_data=self._candlestick_data_repository.get_symbol_candlestick_data(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=interval,
+                start_time=start_time
+            ),
+            start_time=start_time
+        )
+        self._log.info(
+            f'Candlestick data download for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+            f'interval \'{interval}\' completed'
+        )
+
+    def download_candlestick_data_in_bulk(
+        self,
+        candlestick_data_downloads: list[CandlestickDataDownload],
+        incremental: bool = False
+    ) -> None:
+        if not isinstance(self._candlestick_data_repository, IAsyncCandlestickDataRepository):
+            raise ValueError('Bulk downloads require an async candlestick data repository to share its requests')
+        self._log.info(
+            f'Downloading candlestick data in bulk for {len(candlestick_data_downloads)} symbol intervals...'
+        )
+        failed_downloads: int = asyncio.run(
+            self._download_candlestick_data_in_bulk_async(
+                candlestick_data_downloads=candlestick_data_downloads,
+                incremental=incremental
+            )
+        )
+        if failed_downloads > 0:
+            raise RuntimeError(f'{failed_downloads} of {len(candlestick_data_downloads)} bulk downloads failed')
+        self._log.info(
+            f'Candlestick data bulk download for {len(candlestick_data_downloads)} symbol intervals completed'
+        )
+
+    async def _download_candlestick_data_in_bulk_async(
+        self,
+        candlestick_data_downloads: list[CandlestickDataDownload],
+        incremental: bool
+    ) -> int:
+        # Every download shares the repository client and request budget, saving its data as soon as it completes
+        results: list[None | BaseException]
+        async with self._candlestick_data_repository:
+            results = await asyncio.gather(
+                *[
+                    self._download_candlestick_data_async(candlestick_data_download=x, incremental=incremental)
+                    for x in candlestick_data_downloads
+                ],
+                return_exceptions=True
+            )
+        failed_downloads: int = 0
+        candlestick_data_download: CandlestickDataDownload
+        result: None | BaseException
+        for candlestick_data_download, result in zip(candlestick_data_downloads, results):
+            if isinstance(result, BaseException):
+                self._log.error(
+                    f'Candlestick data download for base asset \'{candlestick_data_download.base_asset}\', quote '
+                    f'asset \'{candlestick_data_download.quote_asset}\' and interval '
+                    f'\'{candlestick_data_download.interval}\' failed: {result.__class__.__name__} - {result}'
+                )
+                failed_downloads += 1
+        return failed_downloads
+
+    async def _download_candlestick_data_async(
+        self,
+        candlestick_data_download: CandlestickDataDownload,
+        incremental: bool
+    ) -> None:
+        base_asset: str = candlestick_data_download.base_asset
+        quote_asset: str = candlestick_data_download.quote_asset
+        interval: CandlestickDataInterval = candlestick_data_download.interval
+        stored_candlestick_data: DataFrame | None = (
+            await asyncio.to_thread(
+                self._load_stored_candlestick_data,
                 base_asset=base_asset,
                 quote_asset=quote_asset,
                 interval=interval
             )
+            if incremental else None
+        )
+        start_time: datetime | None = self._get_start_time(stored_candlestick_data)
+        new_candlestick_data: DataFrame = await self._candlestick_data_repository.get_symbol_candlestick_data_async(
+            base_asset=base_asset,
+            quote_asset=quote_asset,
+            interval=interval,
+            start_time=start_time
+        )
+        await asyncio.to_thread(
+            self._save_candlestick_data,
+            base_asset=base_asset,
+            quote_asset=quote_asset,
+            interval=interval,
+            stored_candlestick_data=stored_candlestick_data,
+            new_candlestick_data=new_candlestick_data,
+            start_time=start_time
         )
         self._log.info(
             f'Candlestick data download for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
             f'interval \'{interval}\' completed'
         )
+
+    def _load_stored_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval
+    ) -> DataFrame | None:
+        try:
+            return self._candlestick_data_persistence.load_symbol_candlestick_data(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=interval
+            )
+        except FileNotFoundError:
+            self._log.info(
+                f'No candlestick data stored for base asset \'{base_asset}\', quote asset \'{quote_asset}\' and '
+                f'interval \'{interval}\', downloading it all'
+            )
+            return None
+
+    @staticmethod
+    def _get_start_time(stored_candlestick_data: DataFrame | None) -> datetime | None:
+        if stored_candlestick_data is None or stored_candlestick_data.empty:
+            return None
+        # The last stored candle may have been downloaded before closing, so it is downloaded again
+        return stored_candlestick_data['open_time'].iloc[-1].to_pydatetime()
+
+    def _save_candlestick_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        interval: CandlestickDataInterval,
+        stored_candlestick_data: DataFrame | None,
+        new_candlestick_data: DataFrame,
+        start_time: datetime | None
+    ) -> None:
+        candlestick_data: DataFrame = new_candlestick_data
+        if start_time is not None:
+            self._log.info(
+                f'{len(new_candlestick_data)} candles downloaded after the {len(stored_candlestick_data)} stored ones'
+            )
+            if new_candlestick_data.empty:
+                return
+            # Stored candles are only replaced by the downloaded ones overlapping them, and any gap between both is
+            # filled so the candles keep a fixed stride. Stored columns take the downloaded types (time zones
+            # included), so they concatenate without falling back to objects
+            candlestick_data = self._candlestick_data_gap_filler.fill_missing_values(
+                data=pd.concat(
+                    objs=[
+                        stored_candlestick_data[
+                            stored_candlestick_data['open_time'] < new_candlestick_data['open_time'].iloc[0]
+                        ].astype(new_candlestick_data.dtypes.to_dict()),
+                        new_candlestick_data
+                    ],
+                    ignore_index=True
+                ),
+                interval=interval
+            )
+        self._candlestick_data_persistence.save_symbol_candlestick_data(
+            base_asset=base_asset,
+            quote_asset=quote_asset,
+            interval=interval,
+            candlestick_data=candlestick_data
+        )
@@ -1,17 +1,42 @@
 import logging
+import shutil
+from datetime import datetime
 from logging import Logger
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from uuid import UUID
 
+import numpy as np
 from dependency_injector.wiring import inject, Provide
+from numpy.typing import DTypeLike
 
-from reinforcement_learning import IPpoPoliciesPersistence, PpoAgentTrainer
+from reinforcement_learning import (
+    IPpoPoliciesPersistence,
+    MetricsSinkKind,
+    PpoAgentTrainer,
+    ProfilerKind,
+    VectorEnvironment
+)
 from trading_bot.candlestick.candlestick_data_interval import CandlestickDataInterval
 from trading_bot.candlestick.i_candlestick_data_persistence import ICandlestickDataPersistence
+from trading_bot.environments.i_trading_observation_store import ITradingObservationStore
+from trading_bot.environments.lru_trading_observation_cache import LruTradingObservationCache
+from trading_bot.environments.multi_symbol_trading_environment import MultiSymbolTradingEnvironment
+from trading_bot.environments.multi_symbol_trading_environment_factory import MultiSymbolTradingEnvironmentFactory
 from trading_bot.environments.trading_environment import TradingEnvironment
+from trading_bot.environments.trading_environment_factory import TradingEnvironmentFactory
+from trading_bot.environments.trading_market_data import TradingMarketData
+from trading_bot.environments.trading_market_data_pool import TradingMarketDataPool
+from trading_bot.environments.trading_observation_builder import TradingObservationBuilder
+from trading_bot.environments.trading_observation_dataset import TradingObservationDataset
 
 
 class TradingPpoAgentTrainer:
     _log: Logger = logging.getLogger(__name__)
+    _shared_memory_directory: Path | None = Path('/dev/shm') if Path('/dev/shm').is_dir() else None
+    _candlestick_data_columns: list[str] = ['open_time', 'open', 'high', 'low', 'close', 'close_time']
+    _trading_market_data_directory: Path = Path('./data/trading_market_data')
+    _trading_observation_datasets_directory: Path = Path('./data/trading_observation_datasets')
     _ppo_policies_persistence: IPpoPoliciesPersistence
     _candlestick_data_persistence: ICandlestickDataPersistence
 
@@ -34,26 +59,276 @@ class TradingPpoAgentTrainer:
         lower_interval_lookback_candles: int,
         higher_interval_lookback_candles: int,
         episodes: int,
-        max_time_steps: int
+        max_time_steps: int,
+        environments: int = 1,
+        rollout_workers: int = 0,
+        rollout_steps: int | None = None,
+        gae_lambda: float = 1.0,
+        minibatch_size: int | None = None,
+        target_kl_divergence: float | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        observation_cache_size: int = 0,
+        precompute_observations: bool = False,
+        float16_observations: bool = False,
+        profiled_episodes: tuple[int, int] | None = None,
+        profiler_kind: ProfilerKind = ProfilerKind.cprofile,
+        metrics_sink_kind: MetricsSinkKind | None = None,
+        resume: bool = False
     ) -> None:
         self._log.info(f'Training trading PPO agent with policy ID \'{ppo_policy_id}\'...')
-        PpoAgentTrainer(
-            environment=TradingEnvironment(
-                lower_interval_candlestick_data=self._candlestick_data_persistence.load_symbol_candlestick_data(
-                    base_asset=base_asset,
-                    quote_asset=quote_asset,
-                    interval=lower_interval
+        market_data: TradingMarketData = self._load_market_data(
+            base_asset=base_asset,
+            quote_asset=quote_asset,
+            lower_interval=lower_interval,
+            higher_interval=higher_interval,
+            start_time=start_time,
+            end_time=end_time
+        )
+        trading_observation_dataset_directory: Path | None = (
+            self._prepare_trading_observation_dataset(
+                market_data=market_data,
+                lower_interval_lookback_candles=lower_interval_lookback_candles,
+                higher_interval_lookback_candles=higher_interval_lookback_candles,
+                dtype=(np.float16 if float16_observations else np.float32)
+            )
+            if precompute_observations else None
+        )
+        if rollout_workers > 0:
+            market_data_directory: str
+            with TemporaryDirectory(dir=self._shared_memory_directory) as market_data_directory:
+                market_data.save(Path(market_data_directory))
+                PpoAgentTrainer(
+                    environment=TradingEnvironmentFactory(
+                        market_data_directory=Path(market_data_directory),
+                        lower_interval_lookback_candles=lower_interval_lookback_candles,
+                        higher_interval_lookback_candles=higher_interval_lookback_candles,
+                        observation_cache_size=observation_cache_size,
+                        trading_observation_dataset_directory=trading_observation_dataset_directory
+                    ),
+                    ppo_policies_persistence=self._ppo_policies_persistence,
+                    episodes=episodes,
+                    max_time_steps=max_time_steps,
+                    rollout_workers=rollout_workers,
+                    environments=environments,
+                    rollout_steps=rollout_steps,
+                    gae_lambda=gae_lambda,
+                    minibatch_size=minibatch_size,
+                    target_kl_divergence=target_kl_divergence,
+                    profiled_episodes=profiled_episodes,
+                    profiler_kind=profiler_kind,
+                    metrics_sink_kind=metrics_sink_kind,
+                    resume=resume
+                ).train_ppo_agent(ppo_policy_id)
+        else:
+            # Environments stepped in-process share the same observations, so they share the same cache too
+            trading_observation_store: ITradingObservationStore
+            if trading_observation_dataset_directory is not None:
+                trading_observation_store = TradingObservationDataset.load(trading_observation_dataset_directory)
+            else:
+                trading_observation_store = TradingObservationBuilder(
+                    market_data=market_data,
+                    lower_interval_lookback_candles=lower_interval_lookback_candles,
+                    higher_interval_lookback_candles=higher_interval_lookback_candles
+                )
+            if observation_cache_size > 0 and isinstance(trading_observation_store, TradingObservationBuilder):
+                trading_observation_store = LruTradingObservationCache(
+                    trading_observation_store=trading_observation_store,
+                    max_observations=observation_cache_size
+                )
+            PpoAgentTrainer(
+                environment=VectorEnvironment(
+                    [
+                        TradingEnvironment(
+                            market_data=market_data,
+                            lower_interval_lookback_candles=lower_interval_lookback_candles,
+                            higher_interval_lookback_candles=higher_interval_lookback_candles,
+                            trading_observation_store=trading_observation_store
+                        )
+                        for _ in range(environments)
+                    ]
                 ),
-                higher_interval_candlestick_data=self._candlestick_data_persistence.load_symbol_candlestick_data(
+                ppo_policies_persistence=self._ppo_policies_persistence,
+                episodes=episodes,
+                max_time_steps=max_time_steps,
+                rollout_steps=rollout_steps,
+                gae_lambda=gae_lambda,
+                minibatch_size=minibatch_size,
+                target_kl_divergence=target_kl_divergence,
+                profiled_episodes=profiled_episodes,
+                profiler_kind=profiler_kind,
+                metrics_sink_kind=metrics_sink_kind,
+                resume=resume
+            ).train_ppo_agent(ppo_policy_id)
+            if isinstance(trading_observation_store, LruTradingObservationCache):
+                self._log.info(f'Observation cache {trading_observation_store.get_statistics()}')
+        self._log.info(f'Trading PPO agent with policy ID \'{ppo_policy_id}\' training completed')
+
+    def train_multi_symbol_trading_ppo_agent(
+        self,
+        ppo_policy_id: UUID,
+        symbols: list[tuple[str, str]],
+        lower_interval: CandlestickDataInterval,
+        higher_interval: CandlestickDataInterval,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        episodes: int,
+        max_time_steps: int,
+        environments: int = 1,
+        rollout_workers: int = 0,
+        rollout_steps: int | None = None,
+        gae_lambda: float = 1.0,
+        minibatch_size: int | None = None,
+        target_kl_divergence: float | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        max_loaded_symbols: int = 8,
+        profiled_episodes: tuple[int, int] | None = None,
+        profiler_kind: ProfilerKind = ProfilerKind.cprofile,
+        metrics_sink_kind: MetricsSinkKind | None = None,
+        resume: bool = False
+    ) -> None:
+        self._log.info(
+            f'Training multi-symbol trading PPO agent with policy ID \'{ppo_policy_id}\' over {len(symbols)} symbols...'
+        )
+        # Symbols are preprocessed one at a time onto disk, then memory mapped on demand by every environment, so
+        # evicting a symbol releases its pages
+        market_data_directories: dict[str, Path] = {}
+        base_asset: str
+        quote_asset: str
+        for base_asset, quote_asset in symbols:
+            market_data_directories[f'{base_asset}/{quote_asset}'] = self._prepare_market_data(
+                self._load_market_data(
                     base_asset=base_asset,
                     quote_asset=quote_asset,
-                    interval=higher_interval
+                    lower_interval=lower_interval,
+                    higher_interval=higher_interval,
+                    start_time=start_time,
+                    end_time=end_time
+                )
+            )
+        if rollout_workers > 0:
+            PpoAgentTrainer(
+                environment=MultiSymbolTradingEnvironmentFactory(
+                    market_data_directories=market_data_directories,
+                    lower_interval_lookback_candles=lower_interval_lookback_candles,
+                    higher_interval_lookback_candles=higher_interval_lookback_candles,
+                    max_loaded_market_data=max_loaded_symbols
                 ),
-                lower_interval_lookback_candles=lower_interval_lookback_candles,
-                higher_interval_lookback_candles=higher_interval_lookback_candles
+                ppo_policies_persistence=self._ppo_policies_persistence,
+                episodes=episodes,
+                max_time_steps=max_time_steps,
+                rollout_workers=rollout_workers,
+                environments=environments,
+                rollout_steps=rollout_steps,
+                gae_lambda=gae_lambda,
+                minibatch_size=minibatch_size,
+                target_kl_divergence=target_kl_divergence,
+                profiled_episodes=profiled_episodes,
+                profiler_kind=profiler_kind,
+                metrics_sink_kind=metrics_sink_kind,
+                resume=resume
+            ).train_ppo_agent(ppo_policy_id)
+        else:
+            market_data_pool: TradingMarketDataPool = TradingMarketDataPool(
+                market_data_directories=market_data_directories,
+                max_loaded_market_data=max_loaded_symbols
+            )
+            PpoAgentTrainer(
+                environment=VectorEnvironment(
+                    [
+                        MultiSymbolTradingEnvironment(
+                            market_data_pool=market_data_pool,
+                            lower_interval_lookback_candles=lower_interval_lookback_candles,
+                            higher_interval_lookback_candles=higher_interval_lookback_candles
+                        )
+                        for _ in range(environments)
+                    ]
+                ),
+                ppo_policies_persistence=self._ppo_policies_persistence,
+                episodes=episodes,
+                max_time_steps=max_time_steps,
+                rollout_steps=rollout_steps,
+                gae_lambda=gae_lambda,
+                minibatch_size=minibatch_size,
+                target_kl_divergence=target_kl_divergence,
+                profiled_episodes=profiled_episodes,
+                profiler_kind=profiler_kind,
+                metrics_sink_kind=metrics_sink_kind,
+                resume=resume
+            ).train_ppo_agent(ppo_policy_id)
+        self._log.info(f'Multi-symbol trading PPO agent with policy ID \'{ppo_policy_id}\' training completed')
+
+    def _load_market_data(
+        self,
+        base_asset: str,
+        quote_asset: str,
+        lower_interval: CandlestickDataInterval,
+        higher_interval: CandlestickDataInterval,
+        start_time: datetime | None,
+        end_time: datetime | None
+    ) -> TradingMarketData:
+        return TradingMarketData.from_candlestick_data(
+            lower_interval_candlestick_data=self._candlestick_data_persistence.load_symbol_candlestick_data(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=lower_interval,
+                columns=self._candlestick_data_columns,
+                start_time=start_time,
+                end_time=end_time
             ),
-            ppo_policies_persistence=self._ppo_policies_persistence,
-            episodes=episodes,
-            max_time_steps=max_time_steps
-        ).train_ppo_agent(ppo_policy_id)
-        self._log.info(f'Trading PPO agent with policy ID \'{ppo_policy_id}\' training completed')
+            higher_interval_candlestick_data=self._candlestick_data_persistence.load_symbol_candlestick_data(
+                base_asset=base_asset,
+                quote_asset=quote_asset,
+                interval=higher_interval,
+                columns=self._candlestick_data_columns,
+                start_time=start_time,
+                end_time=end_time
+            )
+        )
+
+    def _prepare_market_data(self, market_data: TradingMarketData) -> Path:
+        # Market data is identified by its fingerprint, so later runs over the same symbols and window reuse it
+        directory: Path = self._trading_market_data_directory.joinpath(market_data.get_fingerprint())
+        if directory.is_dir():
+            self._log.debug(f'Reusing trading market data at \'{directory}\'')
+            return directory
+        building_directory: Path = directory.with_name(f'{directory.name}.tmp')
+        shutil.rmtree(building_directory, ignore_errors=True)
+        building_directory.mkdir(parents=True)
+        market_data.save(building_directory)
+        # Renamed once complete, so an interrupted save is never loaded
+        building_directory.rename(directory)
+        return directory
+
+    def _prepare_trading_observation_dataset(
+        self,
+        market_data: TradingMarketData,
+        lower_interval_lookback_candles: int,
+        higher_interval_lookback_candles: int,
+        dtype: DTypeLike
+    ) -> Path:
+        # Datasets are identified by everything they are built from, so later runs over the same data reuse them
+        directory: Path = self._trading_observation_datasets_directory.joinpath(
+            f'{market_data.get_fingerprint()}_{lower_interval_lookback_candles}_{higher_interval_lookback_candles}_'
+            f'{np.dtype(dtype).name}'
+        )
+        if directory.is_dir():
+            self._log.info(f'Reusing trading observation dataset at \'{directory}\'')
+            return directory
+        size: int = TradingObservationDataset.estimate_size(
+            market_data=market_data,
+            lower_interval_lookback_candles=lower_interval_lookback_candles,
+            higher_interval_lookback_candles=higher_interval_lookback_candles,
+            dtype=dtype
+        )
+        self._log.info(f'Building trading observation dataset of {size / 2 ** 30:0.3f} GiB at \'{directory}\'...')
+        TradingObservationDataset.build(
+            market_data=market_data,
+            lower_interval_lookback_candles=lower_interval_lookback_candles,
+            higher_interval_lookback_candles=higher_interval_lookback_candles,
+            directory=directory,
+            dtype=dtype
+        )
+        self._log.info(f'Trading observation dataset at \'{directory}\' built')
+        return directory
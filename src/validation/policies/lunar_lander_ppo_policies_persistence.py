@@ -2,7 +2,7 @@ import logging
 from logging import Logger
 from uuid import UUID
 
-from reinforcement_learning import IPpoPoliciesPersistence
+from reinforcement_learning import IPpoPoliciesPersistence, PpoAgentCheckpoint
 from validation.policies.lunar_lander_ppo_policy import LunarLanderPpoPolicy
 
 
@@ -17,3 +17,9 @@ class LunarLanderPpoPoliciesPersistence(IPpoPoliciesPersistence):
 
     def save_ppo_policy(self, ppo_policy: LunarLanderPpoPolicy) -> None:
         pass
+
+    def load_ppo_agent_checkpoint(self, ppo_policy_id: UUID) -> PpoAgentCheckpoint | None:
+        return None
+
+    def save_ppo_agent_checkpoint(self, ppo_policy_id: UUID, ppo_agent_checkpoint: PpoAgentCheckpoint) -> None:
+        pass
@@ -40,8 +40,8 @@ class LunarLanderPpoPolicy(PpoPolicy):
         )
         self.to(self._device)
 
-    def forward(self, environment_states: list[LunarLanderEnvironmentState]) -> PpoPolicyOutput:
-        shared_features: Tensor = torch.stack([self._get_shared_features(x) for x in environment_states])
+    def forward_tensors(self, environment_state_input_tensor: Tensor) -> PpoPolicyOutput:
+        shared_features: Tensor = self._shared_layers(environment_state_input_tensor)
         return PpoPolicyOutput(
             action_probabilities=self._actor(shared_features),
             state_values=self._critic(shared_features)
@@ -50,19 +50,22 @@ class LunarLanderPpoPolicy(PpoPolicy):
     def get_device(self) -> device:
         return self._device
 
-    def _get_shared_features(self, environment_state: LunarLanderEnvironmentState) -> Tensor:
+    def get_input_tensors(self, environment_states: list[LunarLanderEnvironmentState]) -> tuple[Tensor]:
         environment_state_input_tensor: Tensor = torch.tensor(
             data=[
-                environment_state.x_coordinate,
-                environment_state.y_coordinate,
-                environment_state.x_velocity,
-                environment_state.y_velocity,
-                environment_state.angle,
-                environment_state.angular_velocity,
-                float(environment_state.left_leg_in_contact_with_ground),
-                float(environment_state.right_leg_in_contact_with_ground)
+                [
+                    x.x_coordinate,
+                    x.y_coordinate,
+                    x.x_velocity,
+                    x.y_velocity,
+                    x.angle,
+                    x.angular_velocity,
+                    float(x.left_leg_in_contact_with_ground),
+                    float(x.right_leg_in_contact_with_ground)
+                ]
+                for x in environment_states
             ],
             device=self._device,
             dtype=torch.float32
         )
-        return self._shared_layers(environment_state_input_tensor)
+        return (environment_state_input_tensor,)